@@ -6,14 +6,39 @@ from astrbot.api import logger
 from astrbot.api.event import AstrMessageEvent, filter
 from astrbot.api.star import Context, Star, register
 
+import asyncio
+import os
 import sys
-from pathlib import Path
 
-PLUGIN_ROOT = Path(__file__).resolve().parent
-if str(PLUGIN_ROOT) not in sys.path:
-    sys.path.insert(0, str(PLUGIN_ROOT))
+# abspath is pure string manipulation; Path.resolve() stats every path
+# component for symlinks on each plugin import. The insert itself must stay
+# unconditional: AstrBot loads main.py under its own package name, while
+# slave_market is imported absolutely below.
+PLUGIN_ROOT = os.path.dirname(os.path.abspath(__file__))
+if PLUGIN_ROOT not in sys.path:
+    sys.path.insert(0, PLUGIN_ROOT)
 
-from slave_market import SlaveMarketEngine, load_game_config
+from slave_market import MicroBatcher, SlaveMarketEngine, load_game_config
+
+
+def _maybe_install_uvloop() -> None:
+    """Swap in uvloop's libuv-backed loop when opted in and still possible.
+
+    AstrBot owns the event loop, so installing the policy is only safe
+    before any loop exists; once one is running we leave it alone.
+    """
+
+    try:
+        asyncio.get_running_loop()
+        return
+    except RuntimeError:
+        pass
+    try:
+        import uvloop
+    except ImportError:
+        return
+    uvloop.install()
+    logger.info("uvloop event loop policy installed.")
 
 
 @register("slave-market", "magisk317", "群聊牛马市场游戏（Python 版）", "1.0.0")
@@ -21,10 +46,20 @@ class SlaveMarketPlugin(Star):
     def __init__(self, context: Context, config: dict | None = None, **_):
         super().__init__(context)
         game_config = load_game_config(config)
+        if game_config.use_uvloop:
+            _maybe_install_uvloop()
         self.engine = SlaveMarketEngine(game_config)
+        self.batcher = MicroBatcher(self.engine)
 
     async def initialize(self):
+        # Most dispatches finish without suspending (cooldown rejects, cached
+        # reads), so let tasks run eagerly up to their first real await
+        # instead of paying a scheduler round-trip per message (3.12+ only).
+        # Handlers must not rely on being scheduled after a loop iteration.
+        if hasattr(asyncio, "eager_task_factory"):
+            asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
         await self.engine.initialize()
+        self.batcher.start()
         logger.info(
             "Slave market plugin initialized with %s commands.",
             len(self.engine.COMMAND_ALIASES),
@@ -34,18 +69,27 @@ class SlaveMarketPlugin(Star):
     async def handle_game_command(self, event: AstrMessageEvent):
         """Routes所有牛马指令到 Python 版引擎。"""
 
-        result = await self.engine.dispatch(event)
+        if self.batcher.running:
+            result = await self.batcher.submit(event)
+        else:
+            result = await self.engine.dispatch(event)
         if not result:
             return
-        if result.image:
-            yield event.image_result(result.image)
-        elif result.message:
-            yield event.plain_result(result.message)
+        # Single slot read per field; image beats message when both are set.
+        image = result.image
+        if image:
+            yield event.image_result(image)
+        else:
+            message = result.message
+            if message:
+                yield event.plain_result(message)
 
     async def terminate(self):
+        await self.batcher.stop()
         await self.engine.shutdown()
         logger.info("Slave market plugin terminated.")
 
 
-# Backward compatibility
+# Backward-compat alias only: a second decorated class here would rerun
+# @register and build_pattern() and double plugin load work.
 SlaveMarketStar = SlaveMarketPlugin
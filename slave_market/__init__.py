@@ -1,10 +1,12 @@
 """Core package for the AstrBot slave market plugin."""
 
 from .engine import SlaveMarketEngine
+from .batching import MicroBatcher
 from .config import GameConfig, DEFAULT_CONFIG, load_game_config
 
 __all__ = [
     "SlaveMarketEngine",
+    "MicroBatcher",
     "GameConfig",
     "DEFAULT_CONFIG",
     "load_game_config",
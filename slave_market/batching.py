@@ -0,0 +1,101 @@
+"""Micro-batching of inbound commands for bursty group chats."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional
+
+from astrbot.api import logger
+
+if TYPE_CHECKING:
+    from astrbot.api.event import AstrMessageEvent
+
+    from .engine import CommandResult, SlaveMarketEngine
+
+
+@dataclass(slots=True)
+class PendingCommand:
+    event: "AstrMessageEvent"
+    future: asyncio.Future
+
+
+class MicroBatcher:
+    """Coalesces commands arriving in the same tick into one engine call.
+
+    Twenty users firing commands at once otherwise means twenty separate
+    passes over engine state. Queued commands are drained together (up to
+    ``max_batch`` items, waiting at most ``max_wait`` seconds after the
+    first) and handed to ``engine.dispatch_batch``, which can amortize
+    shared reads across the flush.
+    """
+
+    def __init__(
+        self,
+        engine: "SlaveMarketEngine",
+        max_batch: int = 16,
+        max_wait: float = 0.01,
+    ):
+        self.engine = engine
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue[PendingCommand] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, event: "AstrMessageEvent") -> Optional["CommandResult"]:
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(PendingCommand(event, future))
+        return await future
+
+    async def _collect_batch(self) -> List[PendingCommand]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(
+                    await asyncio.wait_for(self._queue.get(), remaining)
+                )
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run_loop(self) -> None:
+        while True:
+            batch = await self._collect_batch()
+            try:
+                results = await self.engine.dispatch_batch(
+                    [pending.event for pending in batch]
+                )
+            except Exception as exc:
+                logger.exception("批量指令处理失败")
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(exc)
+                continue
+            for pending, result in zip(batch, results):
+                if not pending.future.done():
+                    pending.future.set_result(result)
+
+
+__all__ = ["MicroBatcher", "PendingCommand"]
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from copy import deepcopy
+import re
+import sys
+from dataclasses import dataclass, field, fields, replace
+from functools import lru_cache
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, List
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Sequence, Tuple
 
 
 def _data_dir() -> Path:
@@ -24,6 +28,14 @@ class RobberyStrategy:
     success_rate: float
     reward_multiplier: float
     penalty_multiplier: float
+    # Fixed-point (x1e6) forms of the multipliers, used by the integer
+    # loot/loss math in the rob path.
+    reward_scaled: int = field(init=False, repr=False)
+    penalty_scaled: int = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.reward_scaled = int(self.reward_multiplier * 1_000_000)
+        self.penalty_scaled = int(self.penalty_multiplier * 1_000_000)
 
 
 @dataclass(slots=True)
@@ -69,6 +81,34 @@ class ShopItem:
     target_stat: str | None = None
 
 
+# Shared read-only template so per-instance copies skip the lambda closure.
+# Keys are interned: they double as dict keys in engine code, where interned
+# strings compare by pointer identity. Callers comparing user input against
+# these tables should sys.intern the input to keep that fast path.
+_DEFAULT_AUTO_TASKS = MappingProxyType(
+    {
+        sys.intern("打工"): False,
+        sys.intern("收获"): False,
+        sys.intern("存款"): False,
+    }
+)
+
+
+def _default_auto_tasks() -> Dict[str, bool]:
+    return dict(_DEFAULT_AUTO_TASKS)
+
+
+_LIST_FIELDS = frozenset(
+    {
+        "allowed_groups",
+        "blocked_groups",
+        "allowed_users",
+        "blocked_users",
+        "initial_admins",
+    }
+)
+
+
 @dataclass(slots=True)
 class LotteryReward:
     label: str
@@ -77,28 +117,32 @@ class LotteryReward:
     weight: float
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class GameConfig:
+    """Read-only game tuning knobs plus derived lookup tables.
+
+    Instances are frozen: every field is fixed once ``load_game_config``
+    returns, which lets hot paths cache derived values safely.
+    """
+
     starting_balance: int = 2000
     work_reward_min: int = 300
     work_reward_max: int = 900
     work_cooldown_seconds: int = 300
     rob_cooldown_seconds: int = 600
-    rob_strategies: List[RobberyStrategy] = field(default_factory=list)
+    rob_strategies: Sequence[RobberyStrategy] = ()
     deposit_interest_rate: float = 0.015
     interest_cooldown_seconds: int = 1800
-    crops: List[CropProfile] = field(default_factory=list)
-    guards: List[GuardProfile] = field(default_factory=list)
-    credit_levels: List[CreditLevel] = field(default_factory=list)
-    vip_definitions: List[VipDefinition] = field(default_factory=list)
+    crops: Sequence[CropProfile] = ()
+    guards: Sequence[GuardProfile] = ()
+    credit_levels: Sequence[CreditLevel] = ()
+    vip_definitions: Sequence[VipDefinition] = ()
     sponsor_image_name: str = "ai.png"
     data_dir: Path = field(default_factory=_data_dir)
     backups_to_keep: int = 10
     red_packet_fee_rate: float = 0.05
     loot_share_ratio: float = 0.1
-    default_auto_tasks: Dict[str, bool] = field(
-        default_factory=lambda: {"打工": False, "收获": False, "存款": False}
-    )
+    default_auto_tasks: Dict[str, bool] = field(default_factory=_default_auto_tasks)
     jail_term_seconds: int = 900
     jail_work_cooldown_seconds: int = 300
     auto_task_interval_seconds: int = 600
@@ -108,52 +152,78 @@ class GameConfig:
     duel_reward_ratio: float = 0.15
     training_gain_min: int = 1
     training_gain_max: int = 4
-    shop_items: List[ShopItem] = field(default_factory=list)
+    shop_items: Sequence[ShopItem] = ()
     welfare_interval_seconds: int = 7200
     welfare_base_amount: int = 800
     welfare_threshold: int = 15000
     welfare_growth: int = 200
     lottery_cost: int = 500
-    lottery_rewards: List[LotteryReward] = field(default_factory=list)
+    lottery_rewards: Sequence[LotteryReward] = ()
     gambling_min_bet: int = 100
     gambling_max_bet: int = 5000
-    allowed_groups: List[str] = field(default_factory=list)
-    blocked_groups: List[str] = field(default_factory=list)
-    allowed_users: List[str] = field(default_factory=list)
-    blocked_users: List[str] = field(default_factory=list)
-    initial_admins: List[str] = field(default_factory=list)
+    allowed_groups: FrozenSet[str] = frozenset()
+    blocked_groups: FrozenSet[str] = frozenset()
+    allowed_users: FrozenSet[str] = frozenset()
+    blocked_users: FrozenSet[str] = frozenset()
+    initial_admins: FrozenSet[str] = frozenset()
+    use_uvloop: bool = False
+    # Derived indexes so hot paths avoid linear scans over the lists above.
+    rob_strategy_by_key: Dict[str, RobberyStrategy] = field(init=False, repr=False)
+    shop_item_by_id: Dict[str, ShopItem] = field(init=False, repr=False)
+    lottery_cum_weights: Tuple[float, ...] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        # Access lists are checked on every message; frozenset membership
+        # keeps that O(1) even when the dashboard hands us plain lists.
+        for name in _LIST_FIELDS:
+            object.__setattr__(self, name, frozenset(getattr(self, name)))
+        object.__setattr__(
+            self,
+            "rob_strategy_by_key",
+            {strategy.key: strategy for strategy in self.rob_strategies},
+        )
+        object.__setattr__(
+            self,
+            "shop_item_by_id",
+            {item.item_id: item for item in self.shop_items},
+        )
+        object.__setattr__(
+            self,
+            "lottery_cum_weights",
+            tuple(accumulate(reward.weight for reward in self.lottery_rewards)),
+        )
 
 
 DEFAULT_CONFIG = GameConfig(
-    rob_strategies=[
+    rob_strategies=(
         RobberyStrategy("steady", "稳健", 0.8, 0.6, 0.4),
         RobberyStrategy("balanced", "均衡", 0.6, 1.0, 0.8),
         RobberyStrategy("risky", "冒险", 0.35, 1.6, 1.2),
-    ],
-    crops=[
+    ),
+    crops=(
         CropProfile("小麦", "🌾", 2, 300, 700),
         CropProfile("西瓜", "🍉", 4, 600, 1100),
         CropProfile("咖啡豆", "☕", 3, 500, 900),
         CropProfile("胡萝卜", "🥕", 2, 250, 600),
-    ],
-    guards=[
+    ),
+    guards=(
         GuardProfile("巡逻保镖", 400, 6, 0.1),
         GuardProfile("精英保镖", 800, 12, 0.25),
         GuardProfile("影卫", 1200, 24, 0.4),
-    ],
-    credit_levels=[
+    ),
+    credit_levels=(
         CreditLevel(1, 0, 10000, 8000),
         CreditLevel(2, 4000, 20000, 16000),
         CreditLevel(3, 9000, 40000, 30000),
         CreditLevel(4, 15000, 80000, 60000),
-    ],
-    vip_definitions=[
+    ),
+    vip_definitions=(
         VipDefinition("日卡", 24, "24 小时 VIP"),
         VipDefinition("周卡", 24 * 7, "7 天 VIP"),
         VipDefinition("月卡", 24 * 30, "30 天 VIP"),
         VipDefinition("小时卡", 1, "自定义小时卡"),
-    ],
-    shop_items=[
+    ),
+    shop_items=(
         ShopItem(
             item_id="str_potion",
             name="力量药剂",
@@ -161,7 +231,7 @@ DEFAULT_CONFIG = GameConfig(
             description="永久 +3 力量",
             effect_type="stat",
             effect_value=3,
-            target_stat="力量",
+            target_stat=sys.intern("力量"),
         ),
         ShopItem(
             item_id="agi_boots",
@@ -170,7 +240,7 @@ DEFAULT_CONFIG = GameConfig(
             description="永久 +3 敏捷",
             effect_type="stat",
             effect_value=3,
-            target_stat="敏捷",
+            target_stat=sys.intern("敏捷"),
         ),
         ShopItem(
             item_id="vit_shield",
@@ -179,16 +249,16 @@ DEFAULT_CONFIG = GameConfig(
             description="永久 +3 体魄",
             effect_type="stat",
             effect_value=3,
-            target_stat="体魄",
+            target_stat=sys.intern("体魄"),
         ),
-    ],
-    lottery_rewards=[
+    ),
+    lottery_rewards=(
         LotteryReward("空手而归", 0, 0, 10),
         LotteryReward("小额奖金", 200, 400, 30),
         LotteryReward("普通奖金", 500, 900, 20),
         LotteryReward("大奖", 1200, 2400, 8),
         LotteryReward("惊喜大奖", 3000, 5000, 2),
-    ],
+    ),
 )
 
 __all__ = [
@@ -205,40 +275,64 @@ __all__ = [
 ]
 
 
+# Tokenizes comma- or newline-separated ID lists inside the C regex engine
+# instead of split + per-item strip in Python bytecode.
+_TOKEN_RE = re.compile(r"[^,\r\n\s][^,\r\n]*")
+
+
 def _normalize_list(value) -> List[str]:
-    if isinstance(value, list):
-        return [str(item).strip() for item in value if str(item).strip()]
+    if isinstance(value, (list, tuple)):
+        return list(filter(None, map(str.strip, map(str, value))))
     if isinstance(value, str):
-        if "," in value:
-            candidates = value.split(",")
-        else:
-            candidates = value.splitlines()
-        return [item.strip() for item in candidates if item.strip()]
+        return [match.strip() for match in _TOKEN_RE.findall(value)]
     return []
 
 
-def load_game_config(overrides: dict | None = None) -> GameConfig:
-    """Create a GameConfig instance merged with overrides from dashboard config."""
-
-    config = deepcopy(DEFAULT_CONFIG)
-    if not overrides:
-        return config
+_CONFIG_FIELDS = frozenset(f.name for f in fields(GameConfig) if f.init)
 
-    list_fields = {
-        "allowed_groups",
-        "blocked_groups",
-        "allowed_users",
-        "blocked_users",
-        "initial_admins",
-    }
 
-    for key, value in overrides.items():
+def _build_config(overrides: dict) -> GameConfig:
+    # Intersect first so unknown dashboard keys never reach the loop body;
+    # replace() then substitutes just the overridden slots in one __init__
+    # call, sharing DEFAULT_CONFIG's immutable profile tuples.
+    kwargs = {}
+    for key in overrides.keys() & _CONFIG_FIELDS:
+        value = overrides[key]
         if value is None:
             continue
-        if key in list_fields:
-            setattr(config, key, _normalize_list(value))
-            continue
-        if hasattr(config, key):
-            setattr(config, key, value)
+        kwargs[key] = _normalize_list(value) if key in _LIST_FIELDS else value
+    return replace(DEFAULT_CONFIG, **kwargs)
 
-    return config
+
+def _freeze(value):
+    """Recursively turn dicts/lists into hashable tuples for the cache key."""
+
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@lru_cache(maxsize=32)
+def _load_cached(key: tuple) -> GameConfig:
+    return _build_config(dict(key))
+
+
+def load_game_config(overrides: dict | None = None) -> GameConfig:
+    """Create a GameConfig instance merged with overrides from dashboard config.
+
+    Results are memoized per overrides content; the frozen GameConfig makes
+    sharing one instance across plugin reloads safe.
+    """
+
+    if not overrides:
+        # DEFAULT_CONFIG is frozen and its profile sequences are tuples, so
+        # the common no-override startup path is a plain O(1) return.
+        return DEFAULT_CONFIG
+    try:
+        key = tuple(sorted((k, _freeze(v)) for k, v in overrides.items()))
+    except TypeError:
+        # Unhashable override value: skip memoization rather than fail.
+        return _build_config(overrides)
+    return _load_cached(key)
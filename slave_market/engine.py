@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import random
 import re
-from datetime import datetime
+import time
+from functools import cached_property, lru_cache
 import asyncio
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Sequence
+from typing import Callable, Dict, Optional, Sequence
 
 from astrbot.api.event import AstrMessageEvent
 from astrbot.api import logger
@@ -35,15 +37,51 @@ from .services.weather import WeatherService
 from .services.achievements import AchievementService, Achievement
 from .services.events import EventService
 from .services.gamble import GamblingService
-from .utils import extract_first_at, normalize_amount, now_ts, format_currency
+from .utils import (
+    extract_first_at,
+    format_currency,
+    normalize_amount,
+    now_ts,
+    pinned_now,
+)
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class CommandResult:
     message: str | None = None
     image: str | None = None
 
 
+# Constant reject replies shared across dispatches; frozen CommandResult
+# makes returning the singletons safe.
+_DENIED = CommandResult("权限受限。")
+_MAINTENANCE = CommandResult("牛马系统维护中，请稍后再试。")
+
+
+# Shared across engine instances; built once at import instead of allocating
+# the Achievement objects and predicate closures per construction.
+_ACHIEVEMENTS = (
+    Achievement(
+        "rich",
+        "高净值玩家",
+        "资产超过 10 万",
+        lambda p: p.balance + p.bank_balance >= 100_000,
+    ),
+    Achievement(
+        "collector",
+        "牛马收集者",
+        "拥有 3 名以上牛马",
+        lambda p: len(p.owned_slaves) >= 3,
+    ),
+    Achievement(
+        "farmer",
+        "农场达人",
+        "力量属性达到 5",
+        lambda p: p.stats.get("力量", 0) >= 5,
+    ),
+)
+
+
 class SlaveMarketEngine:
     COMMAND_ALIASES: Dict[str, str] = {
         "玩家帮助": "help",
@@ -127,13 +165,19 @@ class SlaveMarketEngine:
     }
 
     @classmethod
+    @lru_cache(maxsize=1)
     def build_pattern(cls) -> str:
         return (
             r"^("
             + "|".join(map(re.escape, cls.COMMAND_ALIASES.keys()))
-            + r")(?:\\s+.*)?$"
+            + r")(?:\s+.*)?$"
         )
 
+    @classmethod
+    @lru_cache(maxsize=1)
+    def compiled_pattern(cls) -> re.Pattern[str]:
+        return re.compile(cls.build_pattern())
+
     def __init__(self, config: GameConfig | None = None):
         self.config = config or DEFAULT_CONFIG
         self.repo = GameRepository(self.config)
@@ -150,47 +194,84 @@ class SlaveMarketEngine:
         self.welfare = WelfareService(self.repo, self.config, self.ledger)
         self.lottery = LotteryService(self.repo, self.config, self.ledger)
         self.appearance = AppearanceService(self.repo)
-        self.achievements = AchievementService(
-            self.repo,
-            [
-                Achievement(
-                    "rich",
-                    "高净值玩家",
-                    "资产超过 10 万",
-                    lambda p: p.balance + p.bank_balance >= 100000,
-                ),
-                Achievement(
-                    "collector",
-                    "牛马收集者",
-                    "拥有 3 名以上牛马",
-                    lambda p: len(p.owned_slaves) >= 3,
-                ),
-                Achievement(
-                    "farmer",
-                    "农场达人",
-                    "力量属性达到 5",
-                    lambda p: p.stats.get("力量", 0) >= 5,
-                ),
-            ],
-        )
+        self.achievements = AchievementService(self.repo, _ACHIEVEMENTS)
         self.automation = AutomationService(
             self.repo, self.config, self.economy, self.farm
         )
         self.weather = WeatherService()
         self.events = EventService(self.repo, self.ledger)
         self.gamble = GamblingService(self.repo, self.config, self.ledger)
-        self._command_pattern = re.compile(self.build_pattern())
+        # alias -> bound handler, resolved once so dispatch does a single
+        # dict probe instead of an f-string + getattr per message.
+        self._handlers: Dict[str, Callable] = {}
+        for alias, handler_name in self.COMMAND_ALIASES.items():
+            handler = getattr(self, f"cmd_{handler_name}", None)
+            if handler is None:
+                logger.warning("missing handler for %s", handler_name)
+                continue
+            self._handlers[alias] = handler
+        self._enable_handler = self._handlers.get("启用牛马")
+        # Cheap first-character gate: most non-command chatter bails here
+        # without hashing the message text against the alias table.
+        self._alias_first_chars = frozenset(alias[0] for alias in self._handlers)
+        # Short-TTL caches for per-dispatch repo reads; invalidated by the
+        # admin/enable/disable/wipe handlers.
+        self._disabled_cache: tuple[float, bool] | None = None
+        self._sponsor_path: str | None = None
+        self._refresh_sponsor_path()
+        # keyword -> (ts, player_id) so command bursts against the same
+        # target skip the linear nickname scan. Only the id is cached; the
+        # Player row itself is always re-fetched to stay write-safe.
+        self._target_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
         self._automation_task: asyncio.Task | None = None
 
+    _REPO_CACHE_TTL = 3.0
+    _TARGET_CACHE_TTL = 30.0
+    _TARGET_CACHE_SIZE = 128
+
+    async def _cached_admins(self) -> frozenset[str]:
+        # The repository owns the TTL cache and invalidates it on
+        # add_admin/remove_admin, so the engine just delegates.
+        return await self.repo.cached_admins()
+
+    async def _cached_disabled(self) -> bool:
+        now = now_ts()
+        cached = self._disabled_cache
+        if cached and now - cached[0] < self._REPO_CACHE_TTL:
+            return cached[1]
+        disabled = await self.repo.is_plugin_disabled()
+        self._disabled_cache = (now, disabled)
+        return disabled
+
+    def _invalidate_repo_caches(self) -> None:
+        self._disabled_cache = None
+        self._target_cache.clear()
+
+    @cached_property
+    def _command_pattern(self) -> re.Pattern[str]:
+        # Dict dispatch no longer touches the regex; build it only if an
+        # external subscriber actually asks for it.
+        return self.compiled_pattern()
+
     @property
     def command_regex(self) -> str:
         return self._command_pattern.pattern
 
+    _TS_FORMAT = "%m-%d %H:%M"
+
     @staticmethod
     def _format_ts(timestamp: float) -> str:
-        return datetime.fromtimestamp(timestamp).strftime("%m-%d %H:%M")
+        # time.strftime + localtime stays in C and skips the datetime
+        # object allocation that fromtimestamp().strftime() pays per call.
+        return time.strftime(SlaveMarketEngine._TS_FORMAT, time.localtime(timestamp))
 
     async def initialize(self) -> None:
+        # Only real I/O is awaited here; loop-free wiring happens in
+        # __init__ and _start_automation so startup costs no extra loop turns.
+        await self._async_setup()
+        self._start_automation()
+
+    async def _async_setup(self) -> None:
         await self.repo.load()
         if self.config.initial_admins:
             existing_admins = set(await self.repo.list_admins())
@@ -198,42 +279,67 @@ class SlaveMarketEngine:
                 if admin_id and admin_id not in existing_admins:
                     await self.repo.add_admin(admin_id)
                     existing_admins.add(admin_id)
+
+    def _start_automation(self) -> None:
         if not self._automation_task:
             self._automation_task = asyncio.create_task(self._run_automation())
 
+    async def dispatch_batch(
+        self, events: Sequence[AstrMessageEvent]
+    ) -> list[Optional[CommandResult]]:
+        """Dispatch a burst of events collected by the MicroBatcher.
+
+        Handlers still run one at a time; this is the seam where state
+        shared across a flush (admin list, player rows) can be loaded once.
+        """
+
+        results: list[Optional[CommandResult]] = []
+        for event in events:
+            try:
+                results.append(await self.dispatch(event))
+            except Exception:
+                logger.exception("batched dispatch crashed")
+                results.append(CommandResult("执行失败，请稍后再试。"))
+        return results
+
     async def dispatch(self, event: AstrMessageEvent) -> Optional[CommandResult]:
         text = event.get_message_str().strip()
-        match = self._command_pattern.match(text)
-        if not match:
+        # Resolve the handler before any awaits so non-command traffic costs
+        # zero round-trips; the alias alternation regex stays around for the
+        # @filter.regex subscription but is too slow to run per message here.
+        if text[:1] not in self._alias_first_chars:
+            return None
+        tokens = text.split()
+        if not tokens:
+            return None
+        handler = self._handlers.get(tokens[0])
+        if handler is None:
             return None
         allowed, reason, silent = self._check_access(event)
         if not allowed:
-            return None if silent else CommandResult(reason or "权限受限。")
-        command = match.group(1)
-        args = text[len(command) :].strip().split()
-        handler_name = self.COMMAND_ALIASES[command]
-        handler = getattr(self, f"cmd_{handler_name}", None)
-        if not handler:
-            logger.warning("missing handler for %s", handler_name)
-            return CommandResult("指令暂未实现。")
-        player = await self.players.ensure_player(event)
-        is_admin = player.player_id in await self.repo.list_admins()
-        if await self.repo.is_plugin_disabled() and handler_name != "enable":
-            if not is_admin:
-                return CommandResult("牛马系统维护中，请稍后再试。")
-        try:
-            result = await handler(player, event, args)
-        except GameError as exc:
-            return CommandResult(str(exc))
-        except Exception as exc:
-            logger.exception("command %s crashed", command)
-            return CommandResult(f"执行失败：{exc}")
+            if silent:
+                return None
+            return CommandResult(reason) if reason else _DENIED
+        args = tokens[1:]
+        with pinned_now():
+            player = await self.players.ensure_player(event)
+            is_admin = player.player_id in await self._cached_admins()
+            if await self._cached_disabled() and handler is not self._enable_handler:
+                if not is_admin:
+                    return _MAINTENANCE
+            try:
+                result = await handler(player, event, args)
+            except GameError as exc:
+                return CommandResult(str(exc))
+            except Exception as exc:
+                logger.exception("command %s crashed", tokens[0])
+                return CommandResult(f"执行失败：{exc}")
         return result
 
-    async def cmd_help(
-        self, player: Player, event: AstrMessageEvent, args: Sequence[str]
-    ):
-        lines = [
+    # Static reply texts joined once at class creation; the handlers stay
+    # coroutines to keep the dispatch contract.
+    _HELP_TEXT = "\n".join(
+        [
             "=== 大牛马时代指令速查 ===",
             "基础：我的信息 / 重开 / 玩家指南",
             "信息：玩家档案 / 玩家统计 / 查找玩家 / 账单 / 成就",
@@ -252,12 +358,9 @@ class SlaveMarketEngine:
             "管理：备份列表 / 立即备份 / 恢复备份 / 重开玩家 / 禁用牛马",
             "概览：游戏概览 / 系统资金 / 税收奖池 / 形象 / 设置称号",
         ]
-        return CommandResult("\n".join(lines))
-
-    async def cmd_guide(
-        self, player: Player, event: AstrMessageEvent, args: Sequence[str]
-    ):
-        lines = [
+    )
+    _GUIDE_TEXT = "\n".join(
+        [
             "=== 新手指南 ===",
             "1. 打工或领取补助快速获得启动资金。",
             "2. 存款提升利息与信用，升级后提高银行上限。",
@@ -265,7 +368,18 @@ class SlaveMarketEngine:
             "4. 使用商城道具与训练指令提升属性，参与决斗增身价。",
             "5. 管理员请定期备份或恢复，保障数据安全。",
         ]
-        return CommandResult("\n".join(lines))
+    )
+    _SPONSOR_BONUS_TEXT = "VIP 特权：自动任务、手续费减免、尊贵称号等。"
+
+    async def cmd_help(
+        self, player: Player, event: AstrMessageEvent, args: Sequence[str]
+    ):
+        return CommandResult(self._HELP_TEXT)
+
+    async def cmd_guide(
+        self, player: Player, event: AstrMessageEvent, args: Sequence[str]
+    ):
+        return CommandResult(self._GUIDE_TEXT)
 
     async def cmd_info(
         self, player: Player, event: AstrMessageEvent, args: Sequence[str]
@@ -592,8 +706,9 @@ class SlaveMarketEngine:
         target = player
         if args:
             target = await self._resolve_target(event, args)
-        profile = await self.players.snapshot(target)
-        appearance = await self.appearance.profile(target)
+        profile, appearance = await asyncio.gather(
+            self.players.snapshot(target), self.appearance.profile(target)
+        )
         return CommandResult(f"{profile}\n{appearance}")
 
     async def cmd_search_players(
@@ -622,13 +737,15 @@ class SlaveMarketEngine:
         history = await self.ledger.history(target, limit)
         if not history:
             return CommandResult("暂无账单记录。")
+        now = now_ts()
+        format_ts = self._format_ts
         lines = [f"=== {target.nickname} 最近账单 ==="]
-        for entry in history:
-            ts = self._format_ts(entry.get("ts", now_ts()))
-            direction = "收入" if entry.get("direction") == "income" else "支出"
-            amount = format_currency(entry.get("amount", 0))
-            desc = entry.get("description", "")
-            lines.append(f"[{ts}] {direction} {amount} - {desc}")
+        lines.extend(
+            f"[{format_ts(entry.get('ts', now))}] "
+            f"{'收入' if entry.get('direction') == 'income' else '支出'} "
+            f"{format_currency(entry.get('amount', 0))} - {entry.get('description', '')}"
+            for entry in history
+        )
         return CommandResult("\n".join(lines))
 
     async def cmd_achievement(
@@ -683,10 +800,12 @@ class SlaveMarketEngine:
     async def cmd_system_overview(
         self, player: Player, event: AstrMessageEvent, args: Sequence[str]
     ):
-        stats = await self.players.stats_overview()
-        economy = await self.players.economy_overview()
-        system_balance = await self.repo.get_system_balance()
-        tax_pool = await self.repo.get_tax_pool()
+        stats, economy, system_balance, tax_pool = await asyncio.gather(
+            self.players.stats_overview(),
+            self.players.economy_overview(),
+            self.repo.get_system_balance(),
+            self.repo.get_tax_pool(),
+        )
         pool_time = self._format_ts(tax_pool.get("updated_at", now_ts()))
         lines = [
             stats,
@@ -709,6 +828,7 @@ class SlaveMarketEngine:
     ):
         await self.players.require_admin(player)
         await self.repo.set_plugin_disabled(True)
+        self._invalidate_repo_caches()
         return CommandResult("已禁用牛马系统，普通玩家暂时无法使用指令。")
 
     async def cmd_enable(
@@ -716,6 +836,7 @@ class SlaveMarketEngine:
     ):
         await self.players.require_admin(player)
         await self.repo.set_plugin_disabled(False)
+        self._invalidate_repo_caches()
         return CommandResult("牛马系统已恢复正常。")
 
     async def cmd_prison_work(
@@ -769,22 +890,24 @@ class SlaveMarketEngine:
         text = await self.vip.status(player)
         return CommandResult(text)
 
+    _TRUTHY_STATES = frozenset({"on", "开启", "开", "1"})
+    _STATE_LABELS = {True: "开启", False: "关闭"}
+
     async def cmd_auto_task(
         self, player: Player, event: AstrMessageEvent, args: Sequence[str]
     ):
+        labels = self._STATE_LABELS
         if not args:
             tasks = "\n".join(
-                f"{name}: {'开启' if enabled else '关闭'}"
+                f"{name}: {labels[bool(enabled)]}"
                 for name, enabled in player.auto_tasks.items()
             )
             return CommandResult(tasks)
         task = args[0]
         state = args[1] if len(args) > 1 else "on"
-        enabled = state in ("on", "开启", "开", "1")
+        enabled = state in self._TRUTHY_STATES
         normalized = await self.players.toggle_auto_task(player, task, enabled)
-        return CommandResult(
-            f"已将 {normalized} 设置为 {'开启' if enabled else '关闭'}"
-        )
+        return CommandResult(f"已将 {normalized} 设置为 {labels[enabled]}")
 
     async def cmd_admins(
         self, player: Player, event: AstrMessageEvent, args: Sequence[str]
@@ -803,6 +926,7 @@ class SlaveMarketEngine:
         await self.players.require_admin(player)
         target = await self._resolve_target(event, args)
         await self.players.add_admin(target.player_id)
+        self._invalidate_repo_caches()
         return CommandResult(f"已授予 {target.nickname} 管理权限。")
 
     async def cmd_remove_admin(
@@ -811,6 +935,7 @@ class SlaveMarketEngine:
         await self.players.require_admin(player)
         target = await self._resolve_target(event, args)
         await self.players.remove_admin(target.player_id)
+        self._invalidate_repo_caches()
         return CommandResult(f"已移除 {target.nickname} 的管理权限。")
 
     async def cmd_backup_list(
@@ -841,23 +966,32 @@ class SlaveMarketEngine:
     ):
         await self.players.require_admin(player)
         await self.repo.reset()
+        self._invalidate_repo_caches()
         return CommandResult("数据已重置。")
 
-    async def cmd_sponsor(
-        self, player: Player, event: AstrMessageEvent, args: Sequence[str]
-    ):
+    def _refresh_sponsor_path(self) -> None:
+        """Re-stat the sponsor image; cmd_sponsor serves the cached result."""
+
         image_path = (
             Path(__file__).resolve().parent.parent / self.config.sponsor_image_name
         )
-        if image_path.exists():
-            return CommandResult(image=str(image_path))
+        self._sponsor_path = str(image_path) if image_path.exists() else None
+
+    async def cmd_sponsor(
+        self, player: Player, event: AstrMessageEvent, args: Sequence[str]
+    ):
+        if self._sponsor_path:
+            return CommandResult(image=self._sponsor_path)
+        # The image may have been dropped in after boot; re-check once.
+        self._refresh_sponsor_path()
+        if self._sponsor_path:
+            return CommandResult(image=self._sponsor_path)
         return CommandResult("请在插件目录放置 ai.png 以提供赞助二维码。")
 
     async def cmd_sponsor_bonus(
         self, player: Player, event: AstrMessageEvent, args: Sequence[str]
     ):
-        text = "VIP 特权：自动任务、手续费减免、尊贵称号等。"
-        return CommandResult(text)
+        return CommandResult(self._SPONSOR_BONUS_TEXT)
 
     def _require_amount(self, args: Sequence[str]) -> int:
         if not args:
@@ -880,19 +1014,37 @@ class SlaveMarketEngine:
         if not args:
             raise GameError("请 @ 对方或提供昵称。")
         keyword = args[0]
+        cached = self._target_cache.get(keyword)
+        if cached and now_ts() - cached[0] < self._TARGET_CACHE_TTL:
+            candidate = await self.repo.get_player(cached[1])
+            if candidate:
+                return candidate
         target = await self.players.find_by_keyword(keyword)
         if not target:
             raise GameError("未找到目标玩家。")
+        self._target_cache[keyword] = (now_ts(), target.player_id)
+        if len(self._target_cache) > self._TARGET_CACHE_SIZE:
+            self._target_cache.popitem(last=False)
         return target
 
     async def _run_automation(self) -> None:
+        # Single monotonic-deadline loop: one wakeup per cycle with no drift
+        # from cycle duration, instead of fixed sleeps stacked on top of the
+        # work time.
         interval = max(60, self.config.auto_task_interval_seconds)
+        loop = asyncio.get_running_loop()
+        next_due = loop.time()
         while True:
             try:
                 await self.automation.run_cycle()
             except Exception:
                 logger.exception("自动任务执行失败")
-            await asyncio.sleep(interval)
+            next_due += interval
+            now = loop.time()
+            if next_due <= now:
+                # The cycle overran its slot; skip ahead instead of bursting.
+                next_due = now + interval
+            await asyncio.sleep(next_due - now)
 
     def _check_access(self, event: AstrMessageEvent) -> tuple[bool, str | None, bool]:
         cfg = self.config
@@ -919,6 +1071,7 @@ class SlaveMarketEngine:
             except asyncio.CancelledError:
                 pass
             self._automation_task = None
+        await self.repo.close()
 
 
 __all__ = ["SlaveMarketEngine", "CommandResult"]
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field, asdict
+from dataclasses import MISSING, dataclass, field, fields
 from typing import Dict, List, Optional
-import time
+
+from .utils import now_ts
 
 
 def _ts() -> float:
-    return time.time()
+    return now_ts()
 
 
 @dataclass(slots=True)
@@ -19,7 +20,12 @@ class OwnedSlave:
     loyalty: float = 0.5
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "user_id": self.user_id,
+            "nickname": self.nickname,
+            "price": self.price,
+            "loyalty": self.loyalty,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "OwnedSlave":
@@ -36,10 +42,17 @@ class CropPlot:
     yield_max: int
 
     def ready(self) -> bool:
-        return time.time() - self.planted_at >= self.grow_hours * 3600
+        return now_ts() - self.planted_at >= self.grow_hours * 3600
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "crop_name": self.crop_name,
+            "emoji": self.emoji,
+            "planted_at": self.planted_at,
+            "grow_hours": self.grow_hours,
+            "yield_min": self.yield_min,
+            "yield_max": self.yield_max,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "CropPlot":
@@ -53,10 +66,14 @@ class GuardContract:
     protection_bonus: float
 
     def active(self) -> bool:
-        return time.time() < self.expires_at
+        return now_ts() < self.expires_at
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "name": self.name,
+            "expires_at": self.expires_at,
+            "protection_bonus": self.protection_bonus,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "GuardContract":
@@ -71,14 +88,19 @@ class Loan:
     repaid: bool = False
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "amount": self.amount,
+            "rate": self.rate,
+            "issued_at": self.issued_at,
+            "repaid": self.repaid,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "Loan":
         return cls(**data)
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, weakref_slot=True)
 class Player:
     player_id: str
     platform: str
@@ -117,44 +139,121 @@ class Player:
     signature: str = "热爱生活"
 
     def to_dict(self) -> dict:
-        data = asdict(self)
+        # Sparse wire form: identity and timestamps are always written,
+        # every other scalar only when it differs from its default (most
+        # jail/welfare/cooldown fields never do). from_dict restores the
+        # defaults, so omitted keys round-trip losslessly. Mutable dicts
+        # are shallow-copied so stored state never aliases the live Player.
+        data = {
+            "player_id": self.player_id,
+            "platform": self.platform,
+            "user_id": self.user_id,
+            "nickname": self.nickname,
+            "group_id": self.group_id,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+        for name, default in _PLAYER_SCALARS:
+            value = getattr(self, name)
+            if value != default:
+                data[name] = value
+        if self.owned_slaves:
+            # Struct-of-arrays wire form: five flat lists serialize faster
+            # than one small dict per slave and shrink the shard. In memory
+            # the keyed dict stays, ownership transfers need O(1) pops.
+            slaves = self.owned_slaves
+            values = slaves.values()
+            data["owned_slaves"] = {
+                "keys": list(slaves),
+                "user_ids": [s.user_id for s in values],
+                "nicknames": [s.nickname for s in values],
+                "prices": [s.price for s in values],
+                "loyalties": [s.loyalty for s in values],
+            }
         if self.farmland:
             data["farmland"] = self.farmland.to_dict()
         if self.guard:
             data["guard"] = self.guard.to_dict()
         if self.loan:
             data["loan"] = self.loan.to_dict()
-        data["owned_slaves"] = {k: v.to_dict() for k, v in self.owned_slaves.items()}
+        if self.auto_tasks:
+            data["auto_tasks"] = dict(self.auto_tasks)
+        if self.stats:
+            data["stats"] = dict(self.stats)
+        if self.inventory:
+            data["inventory"] = dict(self.inventory)
+        if self.achievements:
+            data["achievements"] = dict(self.achievements)
         return data
 
     @classmethod
     def from_dict(cls, data: dict) -> "Player":
-        farmland = data.get("farmland")
-        guard = data.get("guard")
-        loan = data.get("loan")
-        owned = data.get("owned_slaves", {})
-        data = dict(data)
-        if farmland:
-            data["farmland"] = CropPlot.from_dict(farmland)
-        if guard:
-            data["guard"] = GuardContract.from_dict(guard)
-        if loan:
-            data["loan"] = Loan.from_dict(loan)
-        data["owned_slaves"] = {
-            slave_id: OwnedSlave.from_dict(slave_data)
-            for slave_id, slave_data in owned.items()
-        }
-        data.setdefault("inventory", {})
-        data.setdefault("stats", {})
-        data.setdefault("last_auto_task", 0.0)
-        data.setdefault("last_training_time", 0.0)
-        data.setdefault("welfare_level", 0)
-        data.setdefault("last_welfare_time", 0.0)
-        data.setdefault("welfare_income", 0)
-        data.setdefault("title", "普通公民")
-        data.setdefault("signature", "热爱生活")
-        data.setdefault("achievements", {})
-        return cls(**data)
+        # Slot-by-slot assembly on a bare __new__ instance: no input dict
+        # copy and no kwargs dispatch. Field tuples are precomputed below.
+        obj = cls.__new__(cls)
+        get = data.get
+        for name in _PLAYER_REQUIRED:
+            setattr(obj, name, data[name])
+        for name, default in _PLAYER_SCALARS:
+            setattr(obj, name, get(name, default))
+        farmland = get("farmland")
+        obj.farmland = CropPlot.from_dict(farmland) if farmland else None
+        guard = get("guard")
+        obj.guard = GuardContract.from_dict(guard) if guard else None
+        loan = get("loan")
+        obj.loan = Loan.from_dict(loan) if loan else None
+        owned = get("owned_slaves") or {}
+        if isinstance(owned.get("keys"), list):
+            obj.owned_slaves = {
+                key: OwnedSlave(user_id, nickname, price, loyalty)
+                for key, user_id, nickname, price, loyalty in zip(
+                    owned["keys"],
+                    owned["user_ids"],
+                    owned["nicknames"],
+                    owned["prices"],
+                    owned["loyalties"],
+                )
+            }
+        else:  # legacy mapping of key -> OwnedSlave dict
+            obj.owned_slaves = {
+                slave_id: OwnedSlave.from_dict(slave_data)
+                for slave_id, slave_data in owned.items()
+            }
+        obj.auto_tasks = get("auto_tasks") or {}
+        obj.stats = get("stats") or {}
+        obj.inventory = get("inventory") or {}
+        obj.achievements = get("achievements") or {}
+        obj.created_at = get("created_at") or _ts()
+        obj.updated_at = get("updated_at") or _ts()
+        return obj
+
+
+# Precomputed once so Player.from_dict skips fields() reflection per call.
+# Nested/factory fields are rebuilt explicitly inside from_dict.
+_PLAYER_NESTED = frozenset(
+    {
+        "farmland",
+        "guard",
+        "loan",
+        "owned_slaves",
+        "auto_tasks",
+        "stats",
+        "inventory",
+        "achievements",
+        "created_at",
+        "updated_at",
+    }
+)
+_PLAYER_REQUIRED = tuple(
+    f.name
+    for f in fields(Player)
+    if f.default is MISSING and f.default_factory is MISSING
+)
+_PLAYER_SCALARS = tuple(
+    (f.name, f.default)
+    for f in fields(Player)
+    if f.default is not MISSING and f.name not in _PLAYER_NESTED
+)
 
 
 @dataclass(slots=True)
@@ -168,7 +267,15 @@ class VipCard:
     duration_override: Optional[int] = None
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "code": self.code,
+            "card_type": self.card_type,
+            "hours": self.hours,
+            "created_at": self.created_at,
+            "redeemed_by": self.redeemed_by,
+            "redeemed_at": self.redeemed_at,
+            "duration_override": self.duration_override,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "VipCard":
@@ -184,19 +291,45 @@ class RedPacket:
     created_at: float
     fee_rate: float
     claimed_amount: int = 0
-    claimed_by: Dict[str, int] = field(default_factory=dict)
+    # Structure-of-arrays claim log: a claim is an O(1) append to both
+    # lists and serialization is two plain list copies.
+    claimant_ids: List[str] = field(default_factory=list)
+    claim_amounts: List[int] = field(default_factory=list)
 
     def finished(self) -> bool:
         return (
-            len(self.claimed_by) >= self.parts
+            len(self.claimant_ids) >= self.parts
             or self.claimed_amount >= self.total_amount
         )
 
+    def add_claim(self, player_id: str, amount: int) -> None:
+        self.claimant_ids.append(player_id)
+        self.claim_amounts.append(amount)
+        self.claimed_amount += amount
+
+    def claimed_by_dict(self) -> Dict[str, int]:
+        return dict(zip(self.claimant_ids, self.claim_amounts))
+
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "packet_id": self.packet_id,
+            "sender_id": self.sender_id,
+            "total_amount": self.total_amount,
+            "parts": self.parts,
+            "created_at": self.created_at,
+            "fee_rate": self.fee_rate,
+            "claimed_amount": self.claimed_amount,
+            "claimant_ids": list(self.claimant_ids),
+            "claim_amounts": list(self.claim_amounts),
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "RedPacket":
+        legacy = data.get("claimed_by")
+        if legacy is not None:
+            data = {k: v for k, v in data.items() if k != "claimed_by"}
+            data["claimant_ids"] = list(legacy)
+            data["claim_amounts"] = list(legacy.values())
         return cls(**data)
 
 
@@ -1,13 +1,33 @@
-"""Persistence helpers built around a JSON document."""
+"""Persistence helpers built around sharded JSON documents."""
 
 from __future__ import annotations
 
 import asyncio
+import gzip
 import json
-import secrets
-from dataclasses import asdict
+import os
+import threading
+from collections import deque
+
+try:  # orjson serializes nested dicts several times faster than stdlib json
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        # default=list covers the bounded deques used for transactions.
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS, default=list)
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - stdlib fallback
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, default=list).encode("utf-8")
+
+    _loads = json.loads
+
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+from weakref import WeakValueDictionary
 import time
 
 from .config import GameConfig
@@ -16,33 +36,210 @@ from .models import Player, VipCard, RedPacket
 
 
 class GameRepository:
-    """Thread-safe repository that keeps all state in a JSON blob."""
+    """Thread-safe repository with per-record files under ``base_dir``.
+
+    The full state lives in memory (``self._state``); disk writes only touch
+    the shard a mutation changed: ``players/{id}.json`` per player,
+    ``vip_cards.json``, ``red_packets/{id}.json``, ``meta.json`` for the
+    scalar bookkeeping, and append-only ``transactions/{id}.jsonl`` logs.
+    A mutation therefore rewrites one record instead of the whole state.
+    """
 
     def __init__(self, config: GameConfig):
         self.config = config
         self.base_dir = config.data_dir
         self.state_path = self.base_dir / "state.json"
+        self.players_dir = self.base_dir / "players"
+        self.red_packets_dir = self.base_dir / "red_packets"
+        self.transactions_dir = self.base_dir / "transactions"
+        self.vip_cards_path = self.base_dir / "vip_cards.json"
+        self.meta_path = self.base_dir / "meta.json"
         self.backup_dir = self.base_dir / "backups"
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        for directory in (
+            self.players_dir,
+            self.red_packets_dir,
+            self.transactions_dir,
+            self.backup_dir,
+        ):
+            directory.mkdir(parents=True, exist_ok=True)
         self._lock = asyncio.Lock()
         self._state: dict | None = None
+        # Debounced writer: mutations mark their shard dirty and wake the
+        # flusher, which writes each dirty shard at most once per window.
+        self._dirty_players: set[str] = set()
+        self._dirty_packets: set[str] = set()
+        self._meta_dirty = False
+        self._vip_dirty = False
+        self._flush_event = asyncio.Event()
+        self._flush_task: asyncio.Task | None = None
+        # Last full-state backup payload, reused while nothing changed.
+        self._backup_payload: bytes | None = None
+        self._backup_stale = True
+        # nickname -> player_id, built lazily for keyword lookups.
+        self._nickname_idx: dict[str, str] | None = None
+        self._jail_idx: dict[str, float] | None = None
+        self._admins_cache: tuple[float, frozenset[str]] | None = None
+        # Appends since the last rotation of each transaction log.
+        self._tx_append_counts: dict[str, int] = {}
+        # Write-behind staging: save_player parks the live object here and
+        # the flusher serializes the latest snapshot once per window, so N
+        # saves of a hot player collapse to one to_dict + one file write.
+        self._dirty_objects: dict[str, Player] = {}
+        # Ledger lines awaiting the next flush, appended per player in one
+        # write instead of one per entry.
+        self._pending_tx_lines: dict[str, list[bytes]] = {}
+        # One live Player per id while any handler holds it: repeat lookups
+        # skip from_dict and concurrent commands share the same row instead
+        # of racing divergent copies. Weak values keep the footprint bounded
+        # to players actually in flight.
+        self._player_cache: WeakValueDictionary[str, Player] = (
+            WeakValueDictionary()
+        )
+
+    _FLUSH_DELAY = 0.2
+    _ADMIN_CACHE_TTL = 30.0
+
+    def _schedule_flush(self) -> None:
+        self._backup_stale = True
+        self._flush_event.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._flush_loop()
+            )
+
+    def _mark_player_dirty(self, player_id: str) -> None:
+        self._dirty_players.add(player_id)
+        self._schedule_flush()
+
+    def _mark_packet_dirty(self, packet_id: str) -> None:
+        self._dirty_packets.add(packet_id)
+        self._schedule_flush()
+
+    def _mark_meta_dirty(self) -> None:
+        self._meta_dirty = True
+        self._schedule_flush()
+
+    def _mark_vip_dirty(self) -> None:
+        self._vip_dirty = True
+        self._schedule_flush()
+
+    async def _flush_loop(self) -> None:
+        try:
+            while True:
+                await self._flush_event.wait()
+                # Let a burst (e.g. an automation cycle saving every player)
+                # finish marking before writing anything once.
+                await asyncio.sleep(self._FLUSH_DELAY)
+                self._flush_event.clear()
+                await self._flush_dirty()
+        except asyncio.CancelledError:
+            pass
+
+    async def _flush_dirty(self) -> None:
+        if self._state is None:
+            return
+        self._materialize_dirty()
+        players, self._dirty_players = self._dirty_players, set()
+        packets, self._dirty_packets = self._dirty_packets, set()
+        meta, self._meta_dirty = self._meta_dirty, False
+        vip, self._vip_dirty = self._vip_dirty, False
+        for player_id in players:
+            await self._write_player(player_id)
+        for packet_id in packets:
+            await self._write_red_packet(packet_id)
+        if meta:
+            await self._write_meta()
+        if vip:
+            await self._write_vip_cards()
+        await self._flush_tx_lines()
+
+    async def close(self) -> None:
+        """Stop the flusher and write anything still pending."""
+
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self._flush_dirty()
+
+    @staticmethod
+    def _shard_name(record_id: str) -> str:
+        # player ids look like "platform:user"; quote keeps them filesystem
+        # safe on every platform. The id inside the JSON stays authoritative,
+        # so the file name never needs to be decoded back.
+        return quote(record_id, safe="")
+
+    def _player_path(self, player_id: str) -> Path:
+        return self.players_dir / f"{self._shard_name(player_id)}.json"
+
+    def _red_packet_path(self, packet_id: str) -> Path:
+        return self.red_packets_dir / f"{self._shard_name(packet_id)}.json"
+
+    def _transactions_path(self, player_id: str) -> Path:
+        return self.transactions_dir / f"{self._shard_name(player_id)}.jsonl"
 
     async def load(self) -> None:
         async with self._lock:
-            if not self.state_path.exists():
-                self._state = self._empty_state()
-                await self._write_state()
+            if any(self.players_dir.iterdir()) or self.meta_path.exists():
+                self._state = await asyncio.to_thread(self._read_shards)
+            elif self.state_path.exists():
+                # Legacy single-blob layout: import it once, then persist the
+                # sharded form so later runs skip this branch.
+                raw = await asyncio.to_thread(self.state_path.read_bytes)
+                self._state = (
+                    _loads(raw) if raw.strip() else self._empty_state()
+                )
+                self._state["vip_cards"] = self._index_vip_cards(
+                    self._state.get("vip_cards", {})
+                )
+                await self._flush_all_locked()
+                await asyncio.to_thread(self._rewrite_transaction_logs)
+                self.state_path.rename(self.state_path.with_suffix(".json.bak"))
             else:
-                raw = await asyncio.to_thread(self.state_path.read_text, "utf-8")
-                if not raw.strip():
-                    self._state = self._empty_state()
-                else:
-                    self._state = json.loads(raw)
+                self._state = self._empty_state()
+                await self._flush_all_locked()
+
+    def _read_shards(self) -> dict:
+        state = self._empty_state()
+        if self.meta_path.exists():
+            state.update(_loads(self.meta_path.read_bytes()))
+        if self.vip_cards_path.exists():
+            state["vip_cards"] = _loads(self.vip_cards_path.read_bytes())
+        state["vip_cards"] = self._index_vip_cards(state["vip_cards"])
+        for path in self.players_dir.glob("*.json"):
+            data = _loads(path.read_bytes())
+            state["players"][data["player_id"]] = data
+        for path in self.red_packets_dir.glob("*.json"):
+            data = _loads(path.read_bytes())
+            state["red_packets"][data["packet_id"]] = data
+        for path in self.transactions_dir.glob("*.jsonl"):
+            entries = [
+                _loads(line)
+                for line in path.read_bytes().splitlines()
+                if line
+            ]
+            if entries:
+                # unquote() inverts the quote(..., safe="") used for shard
+                # names, so logs whose entries carry no player_id still come
+                # back under the real id.
+                player_id = entries[-1].get("player_id") or unquote(path.stem)
+                state["transactions"][player_id] = entries
+        return state
+
+    @staticmethod
+    def _index_vip_cards(cards) -> dict:
+        # Legacy saves kept a list; redemption needs O(1) lookup by code.
+        if isinstance(cards, list):
+            return {data["code"]: data for data in cards}
+        return cards
 
     def _empty_state(self) -> dict:
         return {
             "players": {},
-            "vip_cards": [],
+            "vip_cards": {},
             "red_packets": {},
             "admins": [],
             "transactions": {},
@@ -52,11 +249,85 @@ class GameRepository:
             "event_state": {},
         }
 
-    async def _write_state(self) -> None:
-        if self._state is None:
-            return
-        payload = json.dumps(self._state, ensure_ascii=False, indent=2)
-        await asyncio.to_thread(self.state_path.write_text, payload, "utf-8")
+    def _meta_payload(self) -> dict:
+        assert self._state is not None
+        return {
+            "admins": self._state.get("admins", []),
+            "system_balance": self._state.get("system_balance", 0),
+            "tax_pool": self._state.get("tax_pool", {"amount": 0, "updated_at": 0}),
+            "plugin_disabled": self._state.get("plugin_disabled", False),
+            "event_state": self._state.get("event_state", {}),
+        }
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        # tmp + os.replace keeps the shard intact if we crash mid-write;
+        # fadvise drops the written pages since shards are only read back
+        # at startup.
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+            os.fsync(fd)
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+        os.replace(tmp, path)
+
+    async def _write_json(self, path: Path, payload) -> None:
+        await asyncio.to_thread(self._atomic_write, path, _dumps(payload))
+
+    async def _write_meta(self) -> None:
+        await self._write_json(self.meta_path, self._meta_payload())
+
+    async def _write_vip_cards(self) -> None:
+        assert self._state is not None
+        await self._write_json(self.vip_cards_path, self._state["vip_cards"])
+
+    async def _write_player(self, player_id: str) -> None:
+        assert self._state is not None
+        data = self._state["players"].get(player_id)
+        if data is None:
+            await asyncio.to_thread(
+                self._player_path(player_id).unlink, missing_ok=True
+            )
+        else:
+            await self._write_json(self._player_path(player_id), data)
+
+    async def _write_red_packet(self, packet_id: str) -> None:
+        assert self._state is not None
+        data = self._state["red_packets"].get(packet_id)
+        if data is None:
+            await asyncio.to_thread(
+                self._red_packet_path(packet_id).unlink, missing_ok=True
+            )
+        else:
+            await self._write_json(self._red_packet_path(packet_id), data)
+
+    async def _flush_all_locked(self) -> None:
+        """Rewrite every shard from memory. Caller holds the lock (or is
+        single-threaded startup)."""
+
+        assert self._state is not None
+        await self._write_meta()
+        await self._write_vip_cards()
+        for player_id in self._state["players"]:
+            await self._write_player(player_id)
+        for packet_id in self._state["red_packets"]:
+            await self._write_red_packet(packet_id)
+
+    async def flush_all(self) -> None:
+        await self._ensure_loaded()
+        await self._flush_all_locked()
+
+    def _purge_shards(self) -> None:
+        for path in self.players_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+        for path in self.red_packets_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+        for path in self.transactions_dir.glob("*.jsonl"):
+            path.unlink(missing_ok=True)
 
     async def _ensure_loaded(self) -> None:
         if self._state is None:
@@ -65,41 +336,273 @@ class GameRepository:
     async def list_players(self) -> List[Player]:
         await self._ensure_loaded()
         assert self._state is not None
-        return [Player.from_dict(data) for data in self._state["players"].values()]
+        self._materialize_dirty()
+        cache = self._player_cache
+        players = []
+        for player_id, data in self._state["players"].items():
+            player = cache.get(player_id)
+            if player is None:
+                player = Player.from_dict(data)
+                cache[player_id] = player
+            players.append(player)
+        return players
 
     async def get_player(self, player_id: str) -> Optional[Player]:
         await self._ensure_loaded()
         assert self._state is not None
+        cached = self._player_cache.get(player_id)
+        if cached is not None:
+            return cached
         data = self._state["players"].get(player_id)
         if not data:
             return None
-        return Player.from_dict(data)
+        player = Player.from_dict(data)
+        self._player_cache[player_id] = player
+        return player
 
     async def save_player(self, player: Player) -> Player:
         await self._ensure_loaded()
         assert self._state is not None
-        self._state["players"][player.player_id] = player.to_dict()
-        await self._write_state()
+        self._player_cache[player.player_id] = player
+        self._dirty_objects[player.player_id] = player
+        self._schedule_flush()
         return player
 
+    async def save_players_bulk(self, players: Iterable[Player]) -> None:
+        """Stage many players in one call; the flusher wakes once."""
+
+        await self._ensure_loaded()
+        assert self._state is not None
+        for player in players:
+            self._player_cache[player.player_id] = player
+            self._dirty_objects[player.player_id] = player
+        self._schedule_flush()
+
+    async def add_balance(
+        self, player_id: str, delta: int
+    ) -> Optional[Tuple[int, int]]:
+        """Adjust a player's balance without a full decode/encode cycle.
+
+        A live cached row is mutated in place (it stays authoritative);
+        otherwise the raw shard dict is patched directly. Returns the
+        new (balance, bank_balance) pair, or None when the player does
+        not exist.
+        """
+
+        await self._ensure_loaded()
+        assert self._state is not None
+        cached = self._player_cache.get(player_id)
+        if cached is not None:
+            cached.balance += delta
+            cached.updated_at = time.time()
+            self._dirty_objects[player_id] = cached
+            self._schedule_flush()
+            return cached.balance, cached.bank_balance
+        data = self._state["players"].get(player_id)
+        if data is None:
+            return None
+        balance = data.get("balance", 0) + delta
+        if balance:
+            data["balance"] = balance
+        else:
+            # Keep the sparse-row invariant: defaults stay omitted.
+            data.pop("balance", None)
+        data["updated_at"] = time.time()
+        self._mark_player_dirty(player_id)
+        return balance, data.get("bank_balance", 0)
+
+    def _materialize_dirty(self) -> None:
+        """Serialize staged players into the state table.
+
+        Readers that go through the raw dicts (list_players on uncached
+        rows, keyword search, backups) call this first so they never see a
+        stale or missing row.
+        """
+
+        if not self._dirty_objects:
+            return
+        assert self._state is not None
+        staged, self._dirty_objects = self._dirty_objects, {}
+        table = self._state["players"]
+        for player_id, player in staged.items():
+            self._index_nickname(player_id, player.nickname)
+            self._index_jail(player_id, player.jail_until)
+            table[player_id] = player.to_dict()
+            self._dirty_players.add(player_id)
+
     async def delete_player(self, player_id: str) -> None:
         await self._ensure_loaded()
         assert self._state is not None
-        self._state["players"].pop(player_id, None)
-        await self._write_state()
+        self._dirty_objects.pop(player_id, None)
+        dropped = self._state["players"].pop(player_id, None)
+        if dropped is not None and self._nickname_idx is not None:
+            nickname = dropped.get("nickname")
+            if self._nickname_idx.get(nickname) == player_id:
+                del self._nickname_idx[nickname]
+        if self._jail_idx is not None:
+            self._jail_idx.pop(player_id, None)
+        self._player_cache.pop(player_id, None)
+        self._mark_player_dirty(player_id)
+
+    def _index_nickname(self, player_id: str, nickname: str) -> None:
+        if self._nickname_idx is None:
+            return
+        old = self._state["players"].get(player_id) if self._state else None
+        if old is not None:
+            old_nickname = old.get("nickname")
+            if (
+                old_nickname != nickname
+                and self._nickname_idx.get(old_nickname) == player_id
+            ):
+                del self._nickname_idx[old_nickname]
+        self._nickname_idx[nickname] = player_id
+
+    def _index_jail(self, player_id: str, jail_until: float) -> None:
+        if self._jail_idx is None:
+            return
+        if jail_until > 0:
+            self._jail_idx[player_id] = jail_until
+        else:
+            self._jail_idx.pop(player_id, None)
+
+    async def list_inmates(self, now: float) -> List[Player]:
+        """Players whose sentence runs past ``now``.
+
+        Backed by a lazily built {player_id: jail_until} index so the
+        call touches only jailed rows instead of deserializing the whole
+        roster; expired entries are pruned as they are seen.
+        """
+
+        await self._ensure_loaded()
+        assert self._state is not None
+        self._materialize_dirty()
+        players = self._state["players"]
+        if self._jail_idx is None:
+            self._jail_idx = {
+                pid: until
+                for pid, record in players.items()
+                if (until := record.get("jail_until", 0)) > 0
+            }
+        cache = self._player_cache
+        inmates = []
+        released = []
+        for player_id, until in self._jail_idx.items():
+            if until <= now:
+                released.append(player_id)
+                continue
+            player = cache.get(player_id)
+            if player is None:
+                player = Player.from_dict(players[player_id])
+                cache[player_id] = player
+            inmates.append(player)
+        for player_id in released:
+            del self._jail_idx[player_id]
+        return inmates
+
+    async def get_player_by_nickname(self, nickname: str) -> Optional[Player]:
+        """Exact nickname lookup through the lazily built index."""
+
+        await self._ensure_loaded()
+        assert self._state is not None
+        self._materialize_dirty()
+        players = self._state["players"]
+        if self._nickname_idx is None:
+            self._nickname_idx = {
+                record["nickname"]: pid for pid, record in players.items()
+            }
+        player_id = self._nickname_idx.get(nickname)
+        if player_id is None:
+            return None
+        return await self.get_player(player_id)
+
+    async def search_players(self, keyword: str, limit: int) -> List[Player]:
+        """Up to ``limit`` players whose nickname contains ``keyword``.
+
+        Substring matching is inherently a scan, but it runs over the
+        raw shard dicts and only deserializes the rows it returns.
+        """
+
+        await self._ensure_loaded()
+        assert self._state is not None
+        self._materialize_dirty()
+        matches = []
+        for player_id, record in self._state["players"].items():
+            if keyword in record["nickname"]:
+                player = self._player_cache.get(player_id)
+                if player is None:
+                    player = Player.from_dict(record)
+                    self._player_cache[player_id] = player
+                matches.append(player)
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    async def find_by_keyword(self, keyword: str) -> Optional[Player]:
+        """Resolve a player by exact id, exact nickname, then substring.
+
+        Works on the raw state dicts so only the single match is
+        deserialized; exact nicknames hit a lazily built index.
+        """
+
+        await self._ensure_loaded()
+        assert self._state is not None
+        self._materialize_dirty()
+        players = self._state["players"]
+        data = players.get(keyword)
+        if data is None:
+            if self._nickname_idx is None:
+                self._nickname_idx = {
+                    record["nickname"]: pid for pid, record in players.items()
+                }
+            player_id = self._nickname_idx.get(keyword)
+            if player_id is not None:
+                data = players.get(player_id)
+        if data is None:
+            for record in players.values():
+                if keyword in record["nickname"]:
+                    data = record
+                    break
+        if not data:
+            return None
+        player_id = data["player_id"]
+        cached = self._player_cache.get(player_id)
+        if cached is not None:
+            return cached
+        player = Player.from_dict(data)
+        self._player_cache[player_id] = player
+        return player
 
     async def list_admins(self) -> List[str]:
         await self._ensure_loaded()
         assert self._state is not None
         return list(self._state.get("admins", []))
 
+    async def cached_admins(self) -> frozenset[str]:
+        """Admin ids as a frozenset for O(1) membership tests.
+
+        Served from a short-TTL cache that add_admin/remove_admin,
+        restore and reset invalidate immediately, so every service
+        shares one copy instead of rebuilding a list per check.
+        """
+
+        now = time.time()
+        cached = self._admins_cache
+        if cached is not None and now - cached[0] < self._ADMIN_CACHE_TTL:
+            return cached[1]
+        await self._ensure_loaded()
+        assert self._state is not None
+        admins = frozenset(self._state.get("admins", []))
+        self._admins_cache = (now, admins)
+        return admins
+
     async def add_admin(self, player_id: str) -> None:
         await self._ensure_loaded()
         assert self._state is not None
         admins = set(self._state.get("admins", []))
         admins.add(player_id)
         self._state["admins"] = list(admins)
-        await self._write_state()
+        self._admins_cache = None
+        self._mark_meta_dirty()
 
     async def remove_admin(self, player_id: str) -> None:
         await self._ensure_loaded()
@@ -107,36 +610,53 @@ class GameRepository:
         admins = set(self._state.get("admins", []))
         admins.discard(player_id)
         self._state["admins"] = list(admins)
-        await self._write_state()
+        self._admins_cache = None
+        self._mark_meta_dirty()
 
     async def register_vip_card(self, card: VipCard) -> VipCard:
         await self._ensure_loaded()
         assert self._state is not None
-        self._state["vip_cards"].append(card.to_dict())
-        await self._write_state()
+        self._state["vip_cards"][card.code] = card.to_dict()
+        self._mark_vip_dirty()
         return card
 
+    async def register_vip_cards(self, cards: Iterable[VipCard]) -> None:
+        """Insert many cards with a single dirty-mark/flush window."""
+
+        await self._ensure_loaded()
+        assert self._state is not None
+        table = self._state["vip_cards"]
+        for card in cards:
+            table[card.code] = card.to_dict()
+        self._mark_vip_dirty()
+
     async def update_vip_card(self, card: VipCard) -> None:
         await self._ensure_loaded()
         assert self._state is not None
         cards = self._state["vip_cards"]
-        for idx, data in enumerate(cards):
-            if data["code"] == card.code:
-                cards[idx] = card.to_dict()
-                await self._write_state()
-                return
-        raise NotFound("未找到指定的 VIP 卡密。")
+        if card.code not in cards:
+            raise NotFound("未找到指定的 VIP 卡密。")
+        cards[card.code] = card.to_dict()
+        self._mark_vip_dirty()
+
+    async def get_vip_card(self, code: str) -> Optional[VipCard]:
+        """O(1) lookup in the code-keyed card table."""
+
+        await self._ensure_loaded()
+        assert self._state is not None
+        data = self._state["vip_cards"].get(code)
+        return VipCard.from_dict(data) if data else None
 
     async def list_vip_cards(self) -> List[VipCard]:
         await self._ensure_loaded()
         assert self._state is not None
-        return [VipCard.from_dict(data) for data in self._state["vip_cards"]]
+        return [VipCard.from_dict(data) for data in self._state["vip_cards"].values()]
 
     async def add_red_packet(self, packet: RedPacket) -> RedPacket:
         await self._ensure_loaded()
         assert self._state is not None
         self._state["red_packets"][packet.packet_id] = packet.to_dict()
-        await self._write_state()
+        self._mark_packet_dirty(packet.packet_id)
         return packet
 
     async def get_red_packet(self, packet_id: str) -> Optional[RedPacket]:
@@ -151,55 +671,149 @@ class GameRepository:
         await self._ensure_loaded()
         assert self._state is not None
         self._state["red_packets"][packet.packet_id] = packet.to_dict()
-        await self._write_state()
+        self._mark_packet_dirty(packet.packet_id)
 
     async def purge_red_packet(self, packet_id: str) -> None:
         await self._ensure_loaded()
         assert self._state is not None
         self._state["red_packets"].pop(packet_id, None)
-        await self._write_state()
+        self._mark_packet_dirty(packet_id)
 
     async def create_backup(self) -> Path:
         await self._ensure_loaded()
         assert self._state is not None
+        self._materialize_dirty()
         timestamp = time.strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backup_dir / f"backup_{timestamp}.json"
-        payload = json.dumps(self._state, ensure_ascii=False, indent=2)
-        await asyncio.to_thread(backup_path.write_text, payload, "utf-8")
-        backups = sorted(self.backup_dir.glob("backup_*.json"))
+        backup_path = self.backup_dir / f"backup_{timestamp}.json.gz"
+        if self._backup_payload is not None and not self._backup_stale:
+            payload = self._backup_payload
+        else:
+            payload = _dumps(self._state)
+            self._backup_payload = payload
+            self._backup_stale = False
+        await asyncio.to_thread(self._write_backup, backup_path, payload)
+        backups = self._backup_files()
         if len(backups) > self.config.backups_to_keep:
             for path in backups[: len(backups) - self.config.backups_to_keep]:
                 path.unlink(missing_ok=True)
         return backup_path
 
+    @staticmethod
+    def _write_backup(path: Path, payload: bytes) -> None:
+        # Level 3 keeps compression CPU well below the IO it saves; the
+        # tmp + replace dance mirrors _atomic_write.
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with gzip.open(tmp, "wb", compresslevel=3) as handle:
+            handle.write(payload)
+        os.replace(tmp, path)
+
+    def _backup_files(self) -> List[Path]:
+        # Old uncompressed backups sort alongside new .gz ones by timestamp.
+        return sorted(
+            p
+            for p in self.backup_dir.glob("backup_*.json*")
+            if p.suffix in (".json", ".gz")
+        )
+
     async def list_backups(self) -> List[Path]:
         await self._ensure_loaded()
-        backups = sorted(self.backup_dir.glob("backup_*.json"))
-        return backups
+        return self._backup_files()
 
     async def restore_backup(self, file_name: str) -> None:
         target = self.backup_dir / file_name
         if not target.exists():
             raise NotFound("未找到指定的备份文件。")
-        raw = await asyncio.to_thread(target.read_text, "utf-8")
+        raw = await asyncio.to_thread(target.read_bytes)
+        if target.suffix == ".gz":
+            raw = gzip.decompress(raw)
         async with self._lock:
-            self._state = json.loads(raw)
-            await self._write_state()
+            self._state = _loads(raw)
+            self._state["vip_cards"] = self._index_vip_cards(
+                self._state.get("vip_cards", {})
+            )
+            self._nickname_idx = None
+            self._jail_idx = None
+            self._admins_cache = None
+            self._dirty_objects.clear()
+            self._pending_tx_lines.clear()
+            self._player_cache.clear()
+            self._backup_stale = True
+            await asyncio.to_thread(self._purge_shards)
+            await self._flush_all_locked()
+            await asyncio.to_thread(self._rewrite_transaction_logs)
 
     async def reset(self) -> None:
         async with self._lock:
             self._state = self._empty_state()
-            await self._write_state()
+            self._nickname_idx = None
+            self._jail_idx = None
+            self._admins_cache = None
+            self._dirty_objects.clear()
+            self._pending_tx_lines.clear()
+            self._player_cache.clear()
+            self._backup_stale = True
+            await asyncio.to_thread(self._purge_shards)
+            await self._flush_all_locked()
+
+    def _rewrite_transaction_logs(self) -> None:
+        assert self._state is not None
+        for player_id, entries in self._state.get("transactions", {}).items():
+            lines = b"".join(_dumps(entry) + b"\n" for entry in entries)
+            self._transactions_path(player_id).write_bytes(lines)
+
+    # Rewrite a player's JSONL log after this many appends so the on-disk
+    # file stays within a small multiple of the retained window.
+    _TX_ROTATE_EVERY = 512
 
     async def append_transaction(self, player_id: str, entry: dict, max_entries: int = 30) -> None:
         await self._ensure_loaded()
         assert self._state is not None
         tx_map = self._state.setdefault("transactions", {})
-        entries = tx_map.setdefault(player_id, [])
+        entries = tx_map.get(player_id)
+        if type(entries) is not deque or entries.maxlen != max_entries:
+            # Promote the loaded list once; the bounded deque then evicts
+            # in O(1) instead of re-slicing the list on every append.
+            entries = deque(entries or (), maxlen=max_entries)
+            tx_map[player_id] = entries
+        if not isinstance(entry, dict):
+            # LedgerEntry and friends: convert once here; the retained
+            # window is also the JSON wire format for backups/rotation.
+            entry = entry._asdict()
+        entry.setdefault("player_id", player_id)
         entries.append(entry)
-        if len(entries) > max_entries:
-            del entries[:-max_entries]
-        await self._write_state()
+        self._backup_stale = True
+        # Staged for the flusher: a command emitting several ledger entries
+        # (rob, transfer) lands them in one file append per player.
+        self._pending_tx_lines.setdefault(player_id, []).append(
+            _dumps(entry) + b"\n"
+        )
+        self._schedule_flush()
+
+    async def _flush_tx_lines(self) -> None:
+        if not self._pending_tx_lines:
+            return
+        assert self._state is not None
+        pending, self._pending_tx_lines = self._pending_tx_lines, {}
+        for player_id, lines in pending.items():
+            path = self._transactions_path(player_id)
+            count = self._tx_append_counts.get(player_id, 0) + len(lines)
+            if count >= self._TX_ROTATE_EVERY:
+                # Periodic compaction back to the retained window keeps the
+                # append-only log from growing without bound.
+                self._tx_append_counts[player_id] = 0
+                entries = self._state.get("transactions", {}).get(player_id, ())
+                payload = b"".join(_dumps(item) + b"\n" for item in entries)
+                await asyncio.to_thread(self._atomic_write, path, payload)
+            else:
+                self._tx_append_counts[player_id] = count
+                await asyncio.to_thread(
+                    self._append_line, path, b"".join(lines)
+                )
+
+    @staticmethod
+    def _append_line(path: Path, line: bytes) -> None:
+        with open(path, "ab") as handle:
+            handle.write(line)
 
     async def get_transactions(self, player_id: str, limit: int = 10) -> list[dict]:
         await self._ensure_loaded()
@@ -212,7 +826,7 @@ class GameRepository:
         await self._ensure_loaded()
         assert self._state is not None
         self._state["system_balance"] = self._state.get("system_balance", 0) + amount
-        await self._write_state()
+        self._mark_meta_dirty()
 
     async def get_system_balance(self) -> int:
         await self._ensure_loaded()
@@ -225,7 +839,7 @@ class GameRepository:
         pool = self._state.setdefault("tax_pool", {"amount": 0, "updated_at": 0})
         pool["amount"] = max(0, pool.get("amount", 0) + amount)
         pool["updated_at"] = time.time()
-        await self._write_state()
+        self._mark_meta_dirty()
 
     async def get_tax_pool(self) -> dict:
         await self._ensure_loaded()
@@ -240,7 +854,7 @@ class GameRepository:
         await self._ensure_loaded()
         assert self._state is not None
         self._state["plugin_disabled"] = bool(disabled)
-        await self._write_state()
+        self._mark_meta_dirty()
 
     async def is_plugin_disabled(self) -> bool:
         await self._ensure_loaded()
@@ -256,11 +870,30 @@ class GameRepository:
         await self._ensure_loaded()
         assert self._state is not None
         self._state["event_state"] = state
-        await self._write_state()
+        self._mark_meta_dirty()
 
     @staticmethod
     def generate_code(prefix: str = "vip") -> str:
-        return prefix + secrets.token_hex(4)
+        return prefix + _draw_code_bytes().hex()
+
+
+# Pooled entropy for card codes: one os.urandom syscall refills enough for
+# a thousand codes, so bulk VIP generation stops paying per-code kernel
+# round-trips. Codes keep the established prefix+8-hex format.
+_CODE_BYTES = 4
+_CODE_POOL_SIZE = 4096
+_code_pool = bytearray()
+_code_pool_lock = threading.Lock()
+
+
+def _draw_code_bytes() -> bytes:
+    global _code_pool
+    with _code_pool_lock:
+        if len(_code_pool) < _CODE_BYTES:
+            _code_pool = bytearray(os.urandom(_CODE_POOL_SIZE))
+        chunk = bytes(_code_pool[:_CODE_BYTES])
+        del _code_pool[:_CODE_BYTES]
+    return chunk
 
 
 __all__ = ["GameRepository"]
@@ -0,0 +1,78 @@
+"""Scalar micro-kernels shared by the gamble/lottery/rob paths.
+
+Pure functions over plain numbers so the hot call sites stay free of
+per-call setup (``random.choices`` argument handling, repeated clamp
+expressions) and the arithmetic lives in one audited place.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect
+from random import getrandbits
+from typing import Sequence
+
+
+def pick_index(cum_weights: Sequence[float], r: float) -> int:
+    """Index of the bucket containing ``r`` in a cumulative-weight table.
+
+    ``r`` must lie in ``[0, cum_weights[-1])``.
+    """
+
+    return bisect(cum_weights, r)
+
+
+def loot_amount(balance: int, mult_scaled: int, pct: int) -> int:
+    """Clamped share of ``balance`` taken by a rob outcome.
+
+    Pure integer math: ``mult_scaled`` is the strategy multiplier in
+    x1e6 fixed point, ``pct`` a whole percentage.
+    """
+
+    return min(max(balance * mult_scaled * pct // 100_000_000, 1), balance)
+
+
+def rand_below(n: int) -> int:
+    """Uniform integer in ``[0, n)`` for ``n >= 1``.
+
+    Rejection sampling on getrandbits; skips random.randrange's
+    per-call argument handling, which dominates small draws.
+    """
+
+    k = n.bit_length()
+    r = getrandbits(k)
+    while r >= n:
+        r = getrandbits(k)
+    return r
+
+
+def rand_between(lo: int, hi: int) -> int:
+    """Uniform integer in ``[lo, hi]``, both ends inclusive."""
+
+    return lo + rand_below(hi - lo + 1)
+
+
+def player_value(
+    balance: int, bank_balance: int, n_slaves: int, vip_active: bool
+) -> int:
+    """Market valuation of a player from its scalar inputs."""
+
+    base = 800 + balance // 2 + bank_balance // 4 + n_slaves * 300
+    if vip_active:
+        base = base * 6 // 5
+    return max(500, base)
+
+
+def combat_power(power: int, agility: int, endurance: int, jitter: float) -> float:
+    """Weighted duel power for one combatant."""
+
+    return power * 1.4 + agility * 1.2 + endurance * 1.1 + jitter
+
+
+__all__ = [
+    "pick_index",
+    "loot_amount",
+    "rand_below",
+    "rand_between",
+    "player_value",
+    "combat_power",
+]
@@ -23,14 +23,20 @@ class AchievementService:
         self._achievements: Dict[str, Achievement] = {
             ach.key: ach for ach in achievements
         }
+        self._all_keys = frozenset(self._achievements)
 
     async def evaluate(self, player: Player) -> list[str]:
+        # evaluate only ever stores True, so a key-set difference is enough
+        # to find what is still locked; fully decorated players return
+        # without running a single checker.
+        todo = self._all_keys - player.achievements.keys()
+        if not todo:
+            return []
         unlocked = []
-        for ach in self._achievements.values():
-            if player.achievements.get(ach.key):
-                continue
+        for key in todo:
+            ach = self._achievements[key]
             if ach.checker(player):
-                player.achievements[ach.key] = True
+                player.achievements[key] = True
                 unlocked.append(ach.name)
         if unlocked:
             await self.repo.save_player(player)
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Callable, Awaitable
 
 from astrbot.api import logger
@@ -10,7 +11,7 @@ from ..config import GameConfig
 from ..errors import GameError
 from ..models import Player
 from ..repository import GameRepository
-from ..utils import now_ts
+from ..utils import now_ts, pinned_now
 from .economy import EconomyService
 from .farm import FarmService
 
@@ -32,10 +33,17 @@ class AutomationService:
             "收获": self._auto_harvest,
             "存款": self._auto_deposit,
         }
+        # Fixed iteration order for the per-player loop; avoids copying
+        # auto_tasks.items() and a dict probe per task.
+        self._handler_order = tuple(self.task_handlers.items())
 
     async def run_cycle(self) -> None:
-        now = now_ts()
+        with pinned_now() as now:
+            await self._run_cycle(now)
+
+    async def _run_cycle(self, now: float) -> None:
         players = await self.repo.list_players()
+        eligible = []
         for player in players:
             if player.vip_until <= now:
                 continue
@@ -46,24 +54,48 @@ class AutomationService:
                 and now - player.last_auto_task < self.config.auto_task_interval_seconds
             ):
                 continue
-            await self._run_for_player(player, now)
+            eligible.append(player)
+        if not eligible:
+            return
+        # Per-player task chains are independent, so run them concurrently
+        # and stage the finished rows in one bulk save (one flusher wake-up
+        # instead of one per player).
+        results = await asyncio.gather(
+            *(self._run_for_player(player, now) for player in eligible),
+            return_exceptions=True,
+        )
+        finals = []
+        for player, result in zip(eligible, results):
+            if isinstance(result, BaseException):
+                logger.exception(
+                    "自动任务整体失败：%s", player.player_id, exc_info=result
+                )
+            elif result is not None:
+                finals.append(result)
+        if finals:
+            await self.repo.save_players_bulk(finals)
 
-    async def _run_for_player(self, player: Player, timestamp: float) -> None:
+    async def _run_for_player(
+        self, player: Player, timestamp: float
+    ) -> Player | None:
         current = player
-        for name, enabled in list(current.auto_tasks.items()):
-            if not enabled:
-                continue
-            handler = self.task_handlers.get(name)
-            if not handler:
+        changed = False
+        for name, handler in self._handler_order:
+            if not current.auto_tasks.get(name):
                 continue
             try:
                 current = await handler(current)
+                changed = True
             except GameError as exc:
                 logger.debug("自动任务 %s 被跳过：%s", name, exc)
             except Exception:
                 logger.exception("自动任务 %s 执行异常", name)
+        if not changed:
+            # Nothing ran (all tasks on cooldown or failing): skip the write
+            # entirely rather than persisting an untouched row.
+            return None
         current.last_auto_task = timestamp
-        await self.repo.save_player(current)
+        return current
 
     async def _auto_work(self, player: Player) -> Player:
         await self.economy.work(player)
@@ -74,13 +106,14 @@ class AutomationService:
         return await self._reload(player)
 
     async def _auto_deposit(self, player: Player) -> Player:
-        refreshed = await self._reload(player)
-        player = refreshed
+        # deposit() mutates the instance we already hold, so no reload is
+        # needed on either side: earlier chain handlers hand over their
+        # in-memory row and it stays authoritative.
         available = min(player.balance, player.deposit_limit - player.bank_balance)
         if available <= 0:
             raise GameError("余额不足以存款。")
         await self.economy.deposit(player, available)
-        return await self._reload(player)
+        return player
 
     async def _reload(self, player: Player) -> Player:
         latest = await self.repo.get_player(player.player_id)
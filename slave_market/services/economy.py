@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+import itertools
 import random
 import time
 from typing import Tuple
@@ -11,8 +13,20 @@ from ..errors import GameError, NotFound
 from ..models import Player, RedPacket, Loan
 from ..repository import GameRepository
 from ..utils import clamp, format_currency, now_ts
+from ._kernels import loot_amount
 from .ledger import LedgerService
 
+# Red-packet IDs: startup epoch shifted past a monotonic counter, hex
+# formatted.  Unique within a process lifetime, so two packets sent in
+# the same millisecond can no longer collide the way the old
+# time-in-ms scheme could.
+_PACKET_EPOCH = int(time.time())
+_packet_seq = itertools.count()
+
+
+def _make_packet_id() -> str:
+    return "P" + format((_PACKET_EPOCH << 24) | next(_packet_seq), "x")
+
 
 class EconomyService:
     def __init__(
@@ -24,6 +38,15 @@ class EconomyService:
         self.repo = repo
         self.config = config
         self.ledger = ledger
+        # Joined once for the unknown-strategy error message.
+        self._unknown_strategy_msg = "未知策略，可用策略：" + ",".join(
+            config.rob_strategy_by_key
+        )
+        # Credit tiers keyed by level; _next_credit maps a level to its
+        # successor so upgrades are a single dict probe.
+        levels = config.credit_levels
+        self._credit_by_level = {tier.level: tier for tier in levels}
+        self._next_credit = {a.level: b for a, b in zip(levels, levels[1:])}
 
     async def _log(
         self,
@@ -57,13 +80,19 @@ class EconomyService:
         await self._log(actor, "打工", reward, "income", "打工收益")
         share_note = ""
         if actor.owner_id:
-            owner = await self.repo.get_player(actor.owner_id)
-            if owner:
-                share = max(1, int(reward * self.config.loot_share_ratio))
-                owner.balance += share
-                owner.updated_at = now
-                await self.repo.save_player(owner)
-                await self._log(owner, "贡金", share, "income", "牛马打工分成")
+            share = max(1, int(reward * self.config.loot_share_ratio))
+            result = await self.repo.add_balance(actor.owner_id, share)
+            if result is not None:
+                if self.ledger:
+                    await self.ledger.record_account(
+                        actor.owner_id,
+                        category="贡金",
+                        amount=share,
+                        direction="income",
+                        description="牛马打工分成",
+                        balance=result[0],
+                        bank_balance=result[1],
+                    )
                 share_note = f"\n向雇主进贡 {format_currency(share)}。"
         return f"打工成功，获得 {format_currency(reward)}。{share_note}".strip()
 
@@ -76,14 +105,9 @@ class EconomyService:
                 self.config.rob_cooldown_seconds - (now - attacker.last_rob_time)
             )
             raise GameError(f"抢劫冷却中，{wait} 秒后再来。")
-        strategy = next(
-            (s for s in self.config.rob_strategies if s.key == strategy_key), None
-        )
+        strategy = self.config.rob_strategy_by_key.get(strategy_key)
         if not strategy:
-            raise GameError(
-                "未知策略，可用策略："
-                + ",".join(s.key for s in self.config.rob_strategies)
-            )
+            raise GameError(self._unknown_strategy_msg)
         guard_bonus = (
             target.guard.protection_bonus
             if target.guard and target.guard.active()
@@ -93,33 +117,40 @@ class EconomyService:
         attacker.last_rob_time = now
         roll = random.random()
         if roll <= success_rate and target.balance > 0:
-            loot = int(
-                target.balance * strategy.reward_multiplier * random.uniform(0.2, 0.6)
+            loot = loot_amount(
+                target.balance, strategy.reward_scaled, random.randint(20, 60)
             )
-            loot = max(1, min(loot, target.balance))
             target.balance -= loot
             attacker.balance += loot
-            await self.repo.save_player(target)
-            await self.repo.save_player(attacker)
-            await self._log(attacker, "抢劫", loot, "income", f"抢劫 {target.nickname}")
-            await self._log(
-                target, "被抢", loot, "expense", f"被 {attacker.nickname} 抢劫"
+            # Saves and ledger entries touch independent shards; overlap
+            # them instead of paying four sequential round trips.
+            await asyncio.gather(
+                self.repo.save_player(target),
+                self.repo.save_player(attacker),
+                self._log(
+                    attacker, "抢劫", loot, "income", f"抢劫 {target.nickname}"
+                ),
+                self._log(
+                    target, "被抢", loot, "expense", f"被 {attacker.nickname} 抢劫"
+                ),
             )
             return f"抢劫成功！掠夺 {format_currency(loot)} (成功率 {success_rate * 100:.0f}%)"
         else:
-            loss = int(
-                attacker.balance
-                * strategy.penalty_multiplier
-                * random.uniform(0.1, 0.4)
+            loss = loot_amount(
+                attacker.balance, strategy.penalty_scaled, random.randint(10, 40)
             )
-            loss = max(1, min(loss, attacker.balance))
             attacker.balance -= loss
-            await self.repo.save_player(attacker)
-            await self._log(attacker, "抢劫失败", loss, "expense", "抢劫罚款")
+            # Apply all mutations first, then persist and log in one batch
+            # instead of a second round trip for the guard payout.
+            ops = [
+                self.repo.save_player(attacker),
+                self._log(attacker, "抢劫失败", loss, "expense", "抢劫罚款"),
+            ]
             if target.guard and target.guard.active():
                 target.balance += loss
-                await self.repo.save_player(target)
-                await self._log(target, "保镖赔付", loss, "income", "保镖赔付")
+                ops.append(self.repo.save_player(target))
+                ops.append(self._log(target, "保镖赔付", loss, "income", "保镖赔付"))
+            await asyncio.gather(*ops)
             return f"抢劫失败，被罚款 {format_currency(loss)}"
 
     async def deposit(self, player: Player, amount: int) -> str:
@@ -169,15 +200,15 @@ class EconomyService:
             f"存款：{format_currency(player.bank_balance)} / 上限 {format_currency(player.deposit_limit)}",
             f"利率：{self.config.deposit_interest_rate * 100:.1f}%",
         ]
-        if player.interest_ready_at > now_ts():
-            lines.append(f"利息冷却：{int(player.interest_ready_at - now_ts())} 秒")
+        now = now_ts()
+        if player.interest_ready_at > now:
+            lines.append(f"利息冷却：{int(player.interest_ready_at - now)} 秒")
         return "\n".join(lines)
 
     async def upgrade_credit(self, player: Player) -> str:
-        current_idx = player.credit_level - 1
-        if current_idx >= len(self.config.credit_levels) - 1:
+        next_level = self._next_credit.get(player.credit_level)
+        if next_level is None:
             raise GameError("已达到最高等级。")
-        next_level = self.config.credit_levels[current_idx + 1]
         if player.balance < next_level.upgrade_cost:
             raise GameError(
                 "余额不足，升级需 " + format_currency(next_level.upgrade_cost)
@@ -209,20 +240,22 @@ class EconomyService:
         target.balance += amount - fee
         sender.updated_at = now_ts()
         target.updated_at = now_ts()
-        await self.repo.save_player(sender)
-        await self.repo.save_player(target)
-        await self.repo.adjust_system_balance(fee)
-        await self.repo.adjust_tax_pool(fee)
-        await self._log(sender, "转账", amount, "expense", f"转给 {target.nickname}")
-        await self._log(
-            target, "转账收入", amount - fee, "income", f"来自 {sender.nickname}"
+        await asyncio.gather(
+            self.repo.save_player(sender),
+            self.repo.save_player(target),
+            self.repo.adjust_system_balance(fee),
+            self.repo.adjust_tax_pool(fee),
+            self._log(sender, "转账", amount, "expense", f"转给 {target.nickname}"),
+            self._log(
+                target, "转账收入", amount - fee, "income", f"来自 {sender.nickname}"
+            ),
         )
         return f"转账成功，实收 {format_currency(amount - fee)}，手续费 {format_currency(fee)}"
 
     async def request_loan(self, player: Player, amount: int) -> str:
         if player.loan and not player.loan.repaid:
             raise GameError("请先偿还现有贷款。")
-        tier = self.config.credit_levels[player.credit_level - 1]
+        tier = self._credit_by_level[player.credit_level]
         if amount <= 0 or amount > tier.loan_limit:
             raise GameError(f"额度需在 1~{tier.loan_limit} 之间。")
         player.loan = Loan(
@@ -255,17 +288,16 @@ class EconomyService:
     ) -> Tuple[str, RedPacket]:
         if total <= 0 or parts <= 0:
             raise GameError("金额与份数必须大于 0。")
-        admins = await self.repo.list_admins()
         fee = (
             0
-            if sender.player_id in admins
+            if sender.player_id in await self.repo.cached_admins()
             else int(total * self.config.red_packet_fee_rate)
         )
         if total + fee > sender.balance:
             raise GameError("余额不足以发红包。")
         sender.balance -= total + fee
         packet = RedPacket(
-            packet_id=f"P{int(time.time() * 1000)}",
+            packet_id=_make_packet_id(),
             sender_id=sender.player_id,
             total_amount=total,
             parts=parts,
@@ -291,14 +323,13 @@ class EconomyService:
         if packet.finished():
             await self.repo.purge_red_packet(packet_id)
             raise GameError("来晚了，红包已经被抢光。")
-        if player.player_id in packet.claimed_by:
+        if player.player_id in packet.claimant_ids:
             raise GameError("您已经抢过该红包。")
-        remaining_parts = max(1, packet.parts - len(packet.claimed_by))
+        remaining_parts = max(1, packet.parts - len(packet.claimant_ids))
         remaining_amount = packet.total_amount - packet.claimed_amount
         max_claim = max(1, remaining_amount // remaining_parts)
         claim = random.randint(1, max_claim)
-        packet.claimed_by[player.player_id] = claim
-        packet.claimed_amount += claim
+        packet.add_claim(player.player_id, claim)
         if packet.finished():
             await self.repo.purge_red_packet(packet.packet_id)
         else:
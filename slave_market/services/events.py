@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import random
+import time
 from datetime import datetime
 
 from ..models import Player
@@ -19,6 +20,8 @@ class EventService:
     ):
         self.repo = repo
         self.ledger = ledger
+        self._today_cache: tuple[int, str] = (-1, "")
+        self._state_cache: dict | None = None
         self.events = [
             {
                 "name": "black_market",
@@ -29,7 +32,11 @@ class EventService:
         ]
 
     def _today(self) -> str:
-        return datetime.utcnow().strftime("%Y-%m-%d")
+        # Reformat at most once per UTC day instead of per call.
+        day = int(time.time() // 86400)
+        if day != self._today_cache[0]:
+            self._today_cache = (day, datetime.utcnow().strftime("%Y-%m-%d"))
+        return self._today_cache[1]
 
     async def _settle(self, state: dict) -> None:
         if not state or state.get("name") != "black_market":
@@ -38,23 +45,33 @@ class EventService:
         reward = state.get("reward", 0)
         if not top_id or reward <= 0:
             return
-        player = await self.repo.get_player(top_id)
-        if not player:
+        # Only the balance changes, so skip the full row round trip.
+        result = await self.repo.add_balance(top_id, reward)
+        if result is None:
             return
-        player.balance += reward
-        await self.repo.save_player(player)
         if self.ledger:
-            await self.ledger.record(
-                player,
+            balance, bank_balance = result
+            await self.ledger.record_account(
+                top_id,
                 category="黑市拍卖",
                 amount=reward,
                 direction="income",
                 description="黑市竞拍奖励",
+                balance=balance,
+                bank_balance=bank_balance,
             )
 
     async def refresh(self) -> dict:
+        cached = self._state_cache
+        if (
+            cached is not None
+            and cached.get("day") == self._today()
+            and cached.get("name")
+        ):
+            return cached
         state = await self.repo.get_event_state()
         if state.get("day") == self._today() and state.get("name"):
+            self._state_cache = state
             return state
         await self._settle(state)
         event = random.choice(self.events)
@@ -68,6 +85,7 @@ class EventService:
             "top_player": None,
         }
         await self.repo.save_event_state(new_state)
+        self._state_cache = new_state
         return new_state
 
     async def describe(self) -> str:
@@ -109,6 +127,7 @@ class EventService:
         state["top_player"] = player.player_id
         state["top_bid"] = amount
         await self.repo.save_event_state(state)
+        self._state_cache = state
         await self.repo.save_player(player)
         if self.ledger:
             await self.ledger.record(
@@ -2,13 +2,12 @@
 
 from __future__ import annotations
 
-import random
-
 from ..config import GameConfig, CropProfile
 from ..errors import GameError
 from ..models import Player, CropPlot
 from ..repository import GameRepository
 from ..utils import now_ts, format_currency
+from ._kernels import rand_between
 from .ledger import LedgerService
 
 
@@ -22,15 +21,14 @@ class FarmService:
         self.repo = repo
         self.config = config
         self.ledger = ledger
+        self._crop_index = {crop.name: crop for crop in config.crops}
+        self._unknown_crop_msg = "未知作物，可选：" + ",".join(self._crop_index)
 
     def _get_crop(self, keyword: str) -> CropProfile:
-        keyword = keyword.strip()
-        for crop in self.config.crops:
-            if crop.name == keyword:
-                return crop
-        raise GameError(
-            "未知作物，可选：" + ",".join(c.name for c in self.config.crops)
-        )
+        try:
+            return self._crop_index[keyword.strip()]
+        except KeyError:
+            raise GameError(self._unknown_crop_msg) from None
 
     async def plant(self, player: Player, crop_name: str) -> str:
         if player.farmland and not player.farmland.ready():
@@ -63,7 +61,7 @@ class FarmService:
         crop = player.farmland
         if not crop.ready():
             raise GameError("作物尚未成熟。")
-        gain = random.randint(crop.yield_min, crop.yield_max)
+        gain = rand_between(crop.yield_min, crop.yield_max)
         player.balance += gain
         player.farmland = None
         await self.repo.save_player(player)
@@ -9,6 +9,7 @@ from ..errors import GameError
 from ..models import Player
 from ..repository import GameRepository
 from ..utils import format_currency
+from ._kernels import rand_between
 from .ledger import LedgerService
 
 
@@ -61,8 +62,8 @@ class GamblingService:
         if player.balance < amount:
             raise GameError("余额不足。")
         player.balance -= amount
-        player_roll = random.randint(1, 6)
-        dealer_roll = random.randint(1, 6)
+        player_roll = rand_between(1, 6)
+        dealer_roll = rand_between(1, 6)
         if player_roll >= dealer_roll:
             reward = int(amount * 2.5)
             player.balance += reward
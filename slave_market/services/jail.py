@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import random
 from typing import Callable
 
 from ..config import GameConfig
@@ -10,6 +9,7 @@ from ..errors import GameError
 from ..models import Player
 from ..repository import GameRepository
 from ..utils import format_currency, now_ts
+from ._kernels import rand_between
 
 
 class JailService:
@@ -28,6 +28,10 @@ class JailService:
     def _is_in_jail(self, player: Player) -> bool:
         return player.jail_until > now_ts()
 
+    @staticmethod
+    def _is_in_jail_at(player: Player, now: float) -> bool:
+        return player.jail_until > now
+
     def _bail_cost(self, player: Player) -> int:
         value = self.price_evaluator(player)
         return max(200, int(value * 0.5))
@@ -41,7 +45,7 @@ class JailService:
         if now < player.jail_cooldown_end:
             wait = int(player.jail_cooldown_end - now)
             raise GameError(f"缝纫机冷却中，请 {wait} 秒后再试。")
-        gain = random.randint(120, 360)
+        gain = rand_between(120, 360)
         player.balance += gain
         player.jail_coin += gain
         player.jail_cooldown_end = now + self.cooldown
@@ -63,9 +67,10 @@ class JailService:
         )
 
     async def status(self, player: Player) -> str:
-        if not self._is_in_jail(player):
+        now = now_ts()
+        if not self._is_in_jail_at(player, now):
             return "当前没有刑期，可自由行动。"
-        remain = int((player.jail_until - now_ts()) / 60)
+        remain = int((player.jail_until - now) / 60)
         bail = self._bail_cost(player)
         reason = player.jail_reason or "未知"
         return (
@@ -86,12 +91,11 @@ class JailService:
         return f"交保成功，支付 {format_currency(cost)} 即刻出狱。"
 
     async def inmates(self) -> str:
-        players = await self.repo.list_players()
-        inmates = [p for p in players if self._is_in_jail(p)]
+        now = now_ts()
+        inmates = await self.repo.list_inmates(now)
         if not inmates:
             return "监狱空空如也。"
         lines = ["当前在押："]
-        now = now_ts()
         for player in inmates:
             remain = int((player.jail_until - now) / 60)
             lines.append(f"{player.nickname} - {remain} 分钟")
@@ -2,11 +2,25 @@
 
 from __future__ import annotations
 
+from typing import Iterable, NamedTuple, Tuple
+
 from ..models import Player
 from ..repository import GameRepository
 from ..utils import now_ts
 
 
+class LedgerEntry(NamedTuple):
+    """One ledger line; converted to a dict at the repository boundary."""
+
+    ts: float
+    category: str
+    amount: int
+    direction: str
+    description: str
+    balance: int
+    bank_balance: int
+
+
 class LedgerService:
     def __init__(self, repo: GameRepository, max_entries: int = 30):
         self.repo = repo
@@ -21,16 +35,59 @@ class LedgerService:
         direction: str,
         description: str,
     ) -> None:
-        entry = {
-            "ts": now_ts(),
-            "category": category,
-            "amount": amount,
-            "direction": direction,
-            "description": description,
-            "balance": player.balance,
-            "bank_balance": player.bank_balance,
-        }
-        await self.repo.append_transaction(player.player_id, entry, self.max_entries)
+        await self.record_account(
+            player.player_id,
+            category=category,
+            amount=amount,
+            direction=direction,
+            description=description,
+            balance=player.balance,
+            bank_balance=player.bank_balance,
+        )
+
+    async def record_account(
+        self,
+        player_id: str,
+        *,
+        category: str,
+        amount: int,
+        direction: str,
+        description: str,
+        balance: int,
+        bank_balance: int,
+    ) -> None:
+        """Record an entry for a player known only by id and balances.
+
+        Lets balance-only adjustments log without deserializing the
+        full player row.
+        """
+
+        entry = LedgerEntry(
+            ts=now_ts(),
+            category=category,
+            amount=amount,
+            direction=direction,
+            description=description,
+            balance=balance,
+            bank_balance=bank_balance,
+        )
+        await self.repo.append_transaction(player_id, entry, self.max_entries)
+
+    async def record_many(
+        self, entries: Iterable[Tuple[Player, str, int, str, str]]
+    ) -> None:
+        """Record several (player, category, amount, direction,
+        description) entries in one call; the staged lines share one
+        flush window."""
+
+        for player, category, amount, direction, description in entries:
+            await self.record(
+                player,
+                category=category,
+                amount=amount,
+                direction=direction,
+                description=description,
+            )
 
     async def history(self, player: Player, limit: int = 10) -> list[dict]:
         return await self.repo.get_transactions(player.player_id, limit)
@@ -9,6 +9,7 @@ from ..errors import GameError
 from ..models import Player
 from ..repository import GameRepository
 from ..utils import format_currency
+from ._kernels import pick_index, rand_between
 from .ledger import LedgerService
 
 
@@ -22,19 +23,18 @@ class LotteryService:
         self.repo = repo
         self.config = config
         self.ledger = ledger
+        # Config is frozen, so the pool and its cumulative weights are
+        # fixed for the service lifetime; the empty-pool case is decided
+        # here instead of per draw.
+        self._rewards = tuple(config.lottery_rewards)
+        self._cum_weights = config.lottery_cum_weights
+        self._pool_empty = not self._rewards or self._cum_weights[-1] <= 0
 
     def _pick_reward(self) -> LotteryReward:
-        rewards = self.config.lottery_rewards
-        total_weight = sum(r.weight for r in rewards)
-        if total_weight <= 0:
+        if self._pool_empty:
             raise GameError("奖池未配置。")
-        roll = random.uniform(0, total_weight)
-        upto = 0.0
-        for reward in rewards:
-            upto += reward.weight
-            if roll <= upto:
-                return reward
-        return rewards[-1]
+        r = random.random() * self._cum_weights[-1]
+        return self._rewards[pick_index(self._cum_weights, r)]
 
     async def draw(self, player: Player) -> str:
         cost = self.config.lottery_cost
@@ -42,7 +42,7 @@ class LotteryService:
             raise GameError("余额不足，抽奖需 " + format_currency(cost))
         player.balance -= cost
         reward = self._pick_reward()
-        gain = random.randint(reward.min_amount, reward.max_amount)
+        gain = rand_between(reward.min_amount, reward.max_amount)
         player.balance += gain
         await self.repo.save_player(player)
         await self.repo.adjust_system_balance(cost - gain)
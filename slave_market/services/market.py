@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from typing import List, Tuple
+import heapq
 
 from ..config import GameConfig
 from ..errors import GameError
 from ..models import Player, OwnedSlave
 from ..repository import GameRepository
 from ..utils import format_currency, now_ts
+from ._kernels import player_value
 from .ledger import LedgerService
 
 
@@ -22,6 +23,9 @@ class MarketService:
         self.repo = repo
         self.config = config
         self.ledger = ledger
+        # Valuation memo keyed by the inputs themselves, so any change
+        # to a player's balance/slaves/VIP state invalidates naturally.
+        self._eval_cache: dict[str, tuple[tuple, int]] = {}
 
     async def _log(
         self,
@@ -40,51 +44,67 @@ class MarketService:
                 description=description,
             )
 
-    @staticmethod
-    def evaluate_player(player: Player) -> int:
-        base = 800 + player.balance // 2 + player.bank_balance // 4
-        base += len(player.owned_slaves) * 300
-        if player.vip_until > now_ts():
-            base *= 1.2
-        return max(500, int(base))
+    def evaluate_player(self, player: Player) -> int:
+        vip_active = player.vip_until > now_ts()
+        inputs = (
+            player.balance,
+            player.bank_balance,
+            len(player.owned_slaves),
+            vip_active,
+        )
+        cached = self._eval_cache.get(player.player_id)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+        value = player_value(*inputs)
+        if len(self._eval_cache) > 4096:
+            self._eval_cache.clear()
+        self._eval_cache[player.player_id] = (inputs, value)
+        return value
 
     async def list_market(
         self, exclude_owner: str | None = None, limit: int = 8
     ) -> str:
         players = await self.repo.list_players()
-        candidates: List[Tuple[Player, int]] = []
-        for player in players:
-            if player.owner_id:
-                continue
-            if exclude_owner and player.player_id == exclude_owner:
-                continue
-            candidates.append((player, self.evaluate_player(player)))
-        candidates.sort(key=lambda item: item[1], reverse=True)
-        if not candidates:
+        if not players:
+            return "暂无待售玩家。"
+        # O(N log limit) top-k instead of sorting the whole market.
+        top = heapq.nlargest(
+            limit,
+            (
+                (self.evaluate_player(player), player.player_id, player)
+                for player in players
+                if not player.owner_id
+                and not (exclude_owner and player.player_id == exclude_owner)
+            ),
+            key=lambda item: item[0],
+        )
+        if not top:
             return "暂无待售玩家。"
-        lines = ["牛马市场"]
-        for player, price in candidates[:limit]:
-            lines.append(f"{player.nickname} - {format_currency(price)}")
+        lines = ["牛马市场"] + [
+            f"{player.nickname} - {format_currency(price)}"
+            for price, _, player in top
+        ]
         return "\n".join(lines)
 
     async def list_owned(self, player: Player) -> str:
         if not player.owned_slaves:
             return "您还没有牛马。"
-        lines = ["我的牛马："]
-        for slave in player.owned_slaves.values():
-            lines.append(f"{slave.nickname} - {format_currency(slave.price)}")
+        # Built at full size in one comprehension; no append-growth.
+        lines = ["我的牛马："] + [
+            f"{slave.nickname} - {format_currency(slave.price)}"
+            for slave in player.owned_slaves.values()
+        ]
         return "\n".join(lines)
 
     async def slave_status(self, keyword: str) -> str:
-        players = await self.repo.list_players()
-        for player in players:
-            if player.nickname == keyword or player.player_id == keyword:
-                price = self.evaluate_player(player)
-                owner = player.owner_id or "无"
-                return (
-                    f"{player.nickname}\n身价：{format_currency(price)}\n主人：{owner}"
-                )
-        raise GameError("未找到该玩家。")
+        player = await self.repo.get_player(
+            keyword
+        ) or await self.repo.get_player_by_nickname(keyword)
+        if player is None:
+            raise GameError("未找到该玩家。")
+        price = self.evaluate_player(player)
+        owner = player.owner_id or "无"
+        return f"{player.nickname}\n身价：{format_currency(price)}\n主人：{owner}"
 
     async def _change_owner(
         self,
@@ -97,8 +117,7 @@ class MarketService:
         if target.owner_id == buyer.player_id:
             raise GameError("他已经是您的牛马了。")
         discount = 0
-        admins = await self.repo.list_admins()
-        if buyer.player_id in admins:
+        if buyer.player_id in await self.repo.cached_admins():
             discount = price
         payable = max(0, price - discount)
         if payable > buyer.balance:
@@ -110,19 +129,26 @@ class MarketService:
             price=price,
         )
         buyer.owned_slaves[target.player_id] = slave_entry
+        # Mutate every party first, then persist the lot in one bulk
+        # save (one flusher wake-up instead of one per row).
+        parties = [target, buyer]
+        prev_owner = None
         if target.owner_id:
             prev_owner = await self.repo.get_player(target.owner_id)
             if prev_owner:
                 prev_owner.owned_slaves.pop(target.player_id, None)
                 prev_owner.balance += price
-                await self.repo.save_player(prev_owner)
-                await self._log(
-                    prev_owner, "出售牛马", price, "income", target.nickname
-                )
+                parties.append(prev_owner)
         target.owner_id = buyer.player_id
-        await self.repo.save_player(target)
-        await self.repo.save_player(buyer)
-        await self._log(buyer, "购买牛马", payable, "expense", target.nickname)
+        await self.repo.save_players_bulk(parties)
+        if self.ledger:
+            logs = []
+            if prev_owner:
+                logs.append(
+                    (prev_owner, "出售牛马", price, "income", target.nickname)
+                )
+            logs.append((buyer, "购买牛马", payable, "expense", target.nickname))
+            await self.ledger.record_many(logs)
         return f"成功购入 {target.nickname}，花费 {format_currency(payable)}"
 
     async def buy(self, buyer: Player, target: Player) -> str:
@@ -130,7 +156,7 @@ class MarketService:
         return await self._change_owner(buyer, target, price)
 
     async def snatch(self, buyer: Player, target: Player) -> str:
-        price = int(self.evaluate_player(target) * 2)
+        price = self.evaluate_player(target) * 2
         return await self._change_owner(buyer, target, price)
 
     async def release(self, owner: Player, target: Player) -> str:
@@ -138,28 +164,30 @@ class MarketService:
             raise GameError("他不是您的牛马。")
         owner.owned_slaves.pop(target.player_id, None)
         target.owner_id = None
-        await self.repo.save_player(owner)
-        await self.repo.save_player(target)
+        await self.repo.save_players_bulk((owner, target))
         return f"已放生 {target.nickname}"
 
     async def redeem(self, player: Player) -> str:
         if not player.owner_id:
             raise GameError("您已经自由了。")
-        price = int(self.evaluate_player(player) * 0.6)
+        price = self.evaluate_player(player) * 3 // 5
         if player.balance < price:
             raise GameError("余额不足以赎身。")
         player.balance -= price
         owner_id = player.owner_id
         player.owner_id = None
-        await self.repo.save_player(player)
-        await self._log(player, "赎身", price, "expense", "赎身")
+        parties = [player]
+        owner = None
         if owner_id:
             owner = await self.repo.get_player(owner_id)
             if owner:
                 owner.balance += price
                 owner.owned_slaves.pop(player.player_id, None)
-                await self.repo.save_player(owner)
-                await self._log(owner, "赎身收益", price, "income", player.nickname)
+                parties.append(owner)
+        await self.repo.save_players_bulk(parties)
+        await self._log(player, "赎身", price, "expense", "赎身")
+        if owner:
+            await self._log(owner, "赎身收益", price, "income", player.nickname)
         return f"赎身成功，支付 {format_currency(price)}"
 
 
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
+import heapq
 from dataclasses import replace
-from typing import List, Optional
+from functools import lru_cache
+from typing import ClassVar, List, Optional
 
 from astrbot.api import logger
 from astrbot.api.event import AstrMessageEvent
@@ -16,24 +19,33 @@ from ..utils import format_currency, now_ts
 
 
 class PlayerService:
+    _TASK_ALIAS: ClassVar[dict[str, str]] = {
+        "work": "打工",
+        "harvest": "收获",
+        "deposit": "存款",
+    }
+
     def __init__(self, repo: GameRepository, config: GameConfig):
         self.repo = repo
         self.config = config
 
     @staticmethod
+    @lru_cache(maxsize=1024)
     def player_id(platform_id: str, user_id: str) -> str:
         return f"{platform_id}:{user_id}"
 
     async def ensure_player(self, event: AstrMessageEvent) -> Player:
-        player_id = self.player_id(event.get_platform_id(), event.get_sender_id())
+        platform_id = event.get_platform_id()
+        sender_id = event.get_sender_id()
+        player_id = self.player_id(platform_id, sender_id)
         record = await self.repo.get_player(player_id)
-        nickname = event.get_sender_name() or f"玩家{event.get_sender_id()}"
+        nickname = event.get_sender_name() or f"玩家{sender_id}"
         group_id = event.get_group_id() or ""
         if record is None:
             player = Player(
                 player_id=player_id,
-                platform=event.get_platform_id(),
-                user_id=event.get_sender_id(),
+                platform=platform_id,
+                user_id=sender_id,
                 nickname=nickname,
                 group_id=group_id,
                 balance=self.config.starting_balance,
@@ -64,14 +76,7 @@ class PlayerService:
         keyword = keyword.strip()
         if not keyword:
             return None
-        players = await self.repo.list_players()
-        for player in players:
-            if player.player_id == keyword or player.nickname == keyword:
-                return player
-        for player in players:
-            if keyword in player.nickname:
-                return player
-        return None
+        return await self.repo.find_by_keyword(keyword)
 
     async def reset_player(self, player: Player) -> Player:
         previous_owner = player.owner_id
@@ -90,26 +95,34 @@ class PlayerService:
             vip_until=0,
         )
         fresh.updated_at = now_ts()
-        for slave_id in player.owned_slaves.keys():
-            slave = await self.repo.get_player(slave_id)
-            if slave:
-                slave.owner_id = None
-                await self.repo.save_player(slave)
-        if previous_owner:
-            owner = await self.repo.get_player(previous_owner)
-            if owner:
-                owner.owned_slaves.pop(player.player_id, None)
-                await self.repo.save_player(owner)
         fresh.owner_id = None
-        await self.repo.save_player(fresh)
+        # The freed slaves and previous owner are independent rows:
+        # fetch them concurrently, mutate, then persist in one batch.
+        fetch_ids = list(player.owned_slaves.keys())
+        if previous_owner:
+            fetch_ids.append(previous_owner)
+        fetched = await asyncio.gather(
+            *(self.repo.get_player(pid) for pid in fetch_ids)
+        )
+        touched = [fresh]
+        for pid, row in zip(fetch_ids, fetched):
+            if row is None:
+                continue
+            if pid == previous_owner:
+                row.owned_slaves.pop(player.player_id, None)
+            else:
+                row.owner_id = None
+            touched.append(row)
+        await self.repo.save_players_bulk(touched)
         return fresh
 
     async def snapshot(self, player: Player) -> str:
+        now = now_ts()
         owner_str = "自由人" if not player.owner_id else f"隶属 {player.owner_id}"
         vip_state = (
             "未激活"
-            if player.vip_until <= now_ts()
-            else f"剩余 {int((player.vip_until - now_ts()) / 3600)} 小时"
+            if player.vip_until <= now
+            else f"剩余 {int((player.vip_until - now) / 3600)} 小时"
         )
         lines = [
             f"昵称：{player.nickname}",
@@ -122,7 +135,7 @@ class PlayerService:
         ]
         if player.farmland:
             lines.append(
-                f"作物：{player.farmland.emoji}{player.farmland.crop_name} 已种植 {int((now_ts() - player.farmland.planted_at) / 3600)} 小时"
+                f"作物：{player.farmland.emoji}{player.farmland.crop_name} 已种植 {int((now - player.farmland.planted_at) / 3600)} 小时"
             )
         if player.loan and not player.loan.repaid:
             lines.append(
@@ -131,7 +144,7 @@ class PlayerService:
         return "\n".join(lines)
 
     async def require_admin(self, player: Player) -> None:
-        admins = await self.repo.list_admins()
+        admins = await self.repo.cached_admins()
         if player.player_id not in admins:
             raise PermissionDenied("仅限管理员执行该操作。")
 
@@ -146,56 +159,65 @@ class PlayerService:
 
     async def ranking(self, key: str, limit: int = 10) -> str:
         players = await self.repo.list_players()
+        # Score each player once; the sort then compares plain ints and
+        # the formatter reuses the same value instead of re-deriving it.
         if key == "wealth":
-            players.sort(key=lambda p: p.balance + p.bank_balance, reverse=True)
             title = "资金排行"
-            attr = lambda p: format_currency(p.balance + p.bank_balance)
+            scored = [(p.balance + p.bank_balance, p) for p in players]
+            fmt = format_currency
         elif key == "value":
-            players.sort(
-                key=lambda p: p.balance + p.bank_balance + len(p.owned_slaves) * 600,
-                reverse=True,
-            )
             title = "身价排行"
-            attr = lambda p: format_currency(
-                p.balance + p.bank_balance + len(p.owned_slaves) * 600
-            )
+            scored = [
+                (p.balance + p.bank_balance + len(p.owned_slaves) * 600, p)
+                for p in players
+            ]
+            fmt = format_currency
         else:
-            players.sort(key=lambda p: len(p.owned_slaves), reverse=True)
             title = "牛马排行"
-            attr = lambda p: f"{len(p.owned_slaves)} 头"
-        lines = [title]
-        for idx, player in enumerate(players[:limit], 1):
-            lines.append(f"{idx}. {player.nickname} - {attr(player)}")
+            scored = [(len(p.owned_slaves), p) for p in players]
+            fmt = lambda value: f"{value} 头"
+        top = heapq.nlargest(limit, scored, key=lambda item: item[0])
+        lines = [title] + [
+            f"{idx}. {player.nickname} - {fmt(value)}"
+            for idx, (value, player) in enumerate(top, 1)
+        ]
         return "\n".join(lines)
 
     async def stats_overview(self) -> str:
         players = await self.repo.list_players()
         online = len(players)
-        owners = sum(1 for p in players if p.owned_slaves)
-        enslaved = sum(1 for p in players if p.owner_id)
+        owners = enslaved = 0
+        for p in players:
+            if p.owned_slaves:
+                owners += 1
+            if p.owner_id:
+                enslaved += 1
         return f"玩家总数：{online}\n雇主：{owners}\n牛马：{enslaved}"
 
     async def search(self, keyword: str, limit: int = 5) -> list[Player]:
         keyword = keyword.strip()
         if not keyword:
             raise GameError("请输入关键字。")
-        players = await self.repo.list_players()
-        matches = [p for p in players if keyword in p.nickname]
-        return matches[:limit]
+        return await self.repo.search_players(keyword, limit)
 
     async def economy_overview(self) -> str:
         players = await self.repo.list_players()
-        total_gold = sum(p.balance for p in players)
-        total_deposit = sum(p.bank_balance for p in players)
-        total_loans = sum(
-            p.loan.amount for p in players if p.loan and not p.loan.repaid
-        )
-        vip_count = sum(1 for p in players if p.vip_until > now_ts())
-        richest = max(
-            players,
-            key=lambda p: p.balance + p.bank_balance,
-            default=None,
-        )
+        now = now_ts()
+        # One pass over the roster instead of five.
+        total_gold = total_deposit = total_loans = vip_count = 0
+        richest = None
+        richest_value = -1
+        for p in players:
+            total_gold += p.balance
+            total_deposit += p.bank_balance
+            if p.loan and not p.loan.repaid:
+                total_loans += p.loan.amount
+            if p.vip_until > now:
+                vip_count += 1
+            value = p.balance + p.bank_balance
+            if value > richest_value:
+                richest_value = value
+                richest = p
         lines = [
             f"流通金币：{format_currency(total_gold)}",
             f"银行存款：{format_currency(total_deposit)}",
@@ -211,8 +233,7 @@ class PlayerService:
     async def toggle_auto_task(
         self, player: Player, task_name: str, enabled: bool
     ) -> str:
-        alias = {"work": "打工", "harvest": "收获", "deposit": "存款"}
-        normalized = alias.get(task_name, task_name)
+        normalized = self._TASK_ALIAS.get(task_name, task_name)
         if normalized not in player.auto_tasks:
             raise GameError(
                 "未知自动任务，可用任务：" + ",".join(player.auto_tasks.keys())
@@ -13,14 +13,14 @@ class GuardService:
     def __init__(self, repo: GameRepository, config: GameConfig):
         self.repo = repo
         self.config = config
+        self._guards = {guard.name: guard for guard in config.guards}
+        self._unknown_guard_msg = "未知保镖，可选：" + ",".join(self._guards)
 
     def _guard(self, name: str) -> GuardProfile:
-        for guard in self.config.guards:
-            if guard.name == name:
-                return guard
-        raise GameError(
-            "未知保镖，可选：" + ",".join(g.name for g in self.config.guards)
-        )
+        try:
+            return self._guards[name]
+        except KeyError:
+            raise GameError(self._unknown_guard_msg) from None
 
     def catalog(self) -> str:
         lines = ["保镖市场："]
@@ -33,7 +33,7 @@ class GuardService:
     async def hire(self, player: Player, name: str) -> str:
         guard = self._guard(name)
         cost = guard.hourly_cost
-        admins = await self.repo.list_admins()
+        admins = await self.repo.cached_admins()
         if player.player_id not in admins:
             if player.balance < cost:
                 raise GameError("余额不足。")
@@ -3,16 +3,22 @@
 from __future__ import annotations
 
 import random
+from typing import ClassVar
 
 from ..config import GameConfig
 from ..errors import GameError
 from ..models import Player
 from ..repository import GameRepository
 from ..utils import format_currency, now_ts
+from ._kernels import combat_power
 from .ledger import LedgerService
 
 
 class TrainingService:
+    # Canonical attribute names, fixed order; the frozenset backs the
+    # validity check, the tuple the iteration in stat setup/summing.
+    _VALID_ATTRS: ClassVar[frozenset[str]] = frozenset(("力量", "体魄", "敏捷"))
+    _ATTR_ORDER: ClassVar[tuple[str, ...]] = ("力量", "体魄", "敏捷")
     ATTRIBUTES = {
         "力量": "力量",
         "power": "力量",
@@ -34,18 +40,18 @@ class TrainingService:
         self.ledger = ledger
 
     def _ensure_stats(self, player: Player) -> None:
-        for key in {"力量", "体魄", "敏捷"}:
+        for key in self._ATTR_ORDER:
             player.stats.setdefault(key, 0)
 
     def _resolve_attr(self, keyword: str) -> str:
         attr = self.ATTRIBUTES.get(keyword, keyword)
-        if attr not in {"力量", "体魄", "敏捷"}:
+        if attr not in self._VALID_ATTRS:
             raise GameError("未知属性，仅支持 力量/体魄/敏捷。")
         return attr
 
     def _training_cost(self, player: Player) -> int:
         self._ensure_stats(player)
-        total = sum(player.stats.get(k, 0) for k in ("力量", "体魄", "敏捷"))
+        total = sum(player.stats.get(k, 0) for k in self._ATTR_ORDER)
         return self.config.training_base_cost + total * self.config.training_cost_growth
 
     async def train(self, player: Player, keyword: str) -> str:
@@ -91,66 +97,47 @@ class TrainingService:
         ]
         return "\n".join(lines)
 
-    def _combat_power(self, player: Player) -> float:
+    def _combat_power(self, player: Player, jitter: float) -> float:
         self._ensure_stats(player)
-        base = (
-            player.stats["力量"] * 1.4
-            + player.stats["敏捷"] * 1.2
-            + player.stats["体魄"] * 1.1
-        )
-        return base + random.uniform(-5, 5)
+        stats = player.stats
+        return combat_power(stats["力量"], stats["敏捷"], stats["体魄"], jitter)
 
     async def duel(self, attacker: Player, defender: Player) -> str:
         if attacker.player_id == defender.player_id:
             raise GameError("不能和自己决斗。")
-        atk_power = self._combat_power(attacker)
-        def_power = self._combat_power(defender)
+        # Derive both jitters (and the tiebreak sign) from cheap
+        # random() calls bound to a local.
+        rng = random.random
+        atk_power = self._combat_power(attacker, rng() * 10 - 5)
+        def_power = self._combat_power(defender, rng() * 10 - 5)
         total_asset = max(1, defender.balance + defender.bank_balance)
         reward = max(500, int(total_asset * self.config.duel_reward_ratio))
         if atk_power == def_power:
-            atk_power += random.uniform(-1, 1)
+            atk_power += rng() * 2 - 1
         if atk_power > def_power:
             loot = min(reward, defender.balance)
             defender.balance -= loot
             attacker.balance += loot
-            await self.repo.save_player(defender)
-            await self.repo.save_player(attacker)
+            await self.repo.save_players_bulk((defender, attacker))
             if self.ledger:
-                await self.ledger.record(
-                    attacker,
-                    category="决斗",
-                    amount=loot,
-                    direction="income",
-                    description=f"击败 {defender.nickname}",
-                )
-                await self.ledger.record(
-                    defender,
-                    category="决斗",
-                    amount=loot,
-                    direction="expense",
-                    description=f"输给 {attacker.nickname}",
+                await self.ledger.record_many(
+                    (
+                        (attacker, "决斗", loot, "income", f"击败 {defender.nickname}"),
+                        (defender, "决斗", loot, "expense", f"输给 {attacker.nickname}"),
+                    )
                 )
             return f"{attacker.nickname} 胜利，掠夺 {format_currency(loot)}！"
         else:
             fine = min(reward // 2, attacker.balance)
             attacker.balance -= fine
             defender.balance += fine
-            await self.repo.save_player(attacker)
-            await self.repo.save_player(defender)
+            await self.repo.save_players_bulk((attacker, defender))
             if self.ledger:
-                await self.ledger.record(
-                    attacker,
-                    category="决斗",
-                    amount=fine,
-                    direction="expense",
-                    description=f"输给 {defender.nickname}",
-                )
-                await self.ledger.record(
-                    defender,
-                    category="决斗",
-                    amount=fine,
-                    direction="income",
-                    description=f"击败 {attacker.nickname}",
+                await self.ledger.record_many(
+                    (
+                        (attacker, "决斗", fine, "expense", f"输给 {defender.nickname}"),
+                        (defender, "决斗", fine, "income", f"击败 {attacker.nickname}"),
+                    )
                 )
             return f"{defender.nickname} 守住了尊严，反向收取 {format_currency(fine)}！"
 
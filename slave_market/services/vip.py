@@ -16,14 +16,14 @@ class VipService:
     def __init__(self, repo: GameRepository, config: GameConfig):
         self.repo = repo
         self.config = config
+        self._definitions = {d.key: d for d in config.vip_definitions}
+        self._unknown_card_msg = "未知卡种，可选：" + ",".join(self._definitions)
 
     def _definition(self, card_type: str) -> VipDefinition:
-        for definition in self.config.vip_definitions:
-            if definition.key == card_type:
-                return definition
-        raise GameError(
-            "未知卡种，可选：" + ",".join(d.key for d in self.config.vip_definitions)
-        )
+        try:
+            return self._definitions[card_type]
+        except KeyError:
+            raise GameError(self._unknown_card_msg) from None
 
     async def generate(
         self, card_type: str, amount: int, duration_hint: str | None = None
@@ -46,8 +46,7 @@ class VipService:
                     duration_override=hours if card_type == "小时卡" else None,
                 )
             )
-        for card in cards:
-            await self.repo.register_vip_card(card)
+        await self.repo.register_vip_cards(cards)
         return cards
 
     def _parse_range(self, text: str) -> int:
@@ -57,24 +56,25 @@ class VipService:
         return int(text)
 
     async def redeem(self, player: Player, code: str) -> str:
-        cards = await self.repo.list_vip_cards()
-        for card in cards:
-            if card.code == code:
-                if card.redeemed_by:
-                    raise GameError("该卡密已被使用。")
-                card.redeemed_by = player.player_id
-                card.redeemed_at = now_ts()
-                await self.repo.update_vip_card(card)
-                duration = card.hours * 3600
-                player.vip_until = max(player.vip_until, now_ts()) + duration
-                await self.repo.save_player(player)
-                return f"VIP 激活成功，剩余 {int((player.vip_until - now_ts()) / 3600)} 小时"
-        raise GameError("未找到该卡密。")
+        card = await self.repo.get_vip_card(code)
+        if card is None:
+            raise GameError("未找到该卡密。")
+        if card.redeemed_by:
+            raise GameError("该卡密已被使用。")
+        now = now_ts()
+        card.redeemed_by = player.player_id
+        card.redeemed_at = now
+        await self.repo.update_vip_card(card)
+        duration = card.hours * 3600
+        player.vip_until = max(player.vip_until, now) + duration
+        await self.repo.save_player(player)
+        return f"VIP 激活成功，剩余 {int((player.vip_until - now) / 3600)} 小时"
 
     async def status(self, player: Player) -> str:
-        if player.vip_until <= now_ts():
+        now = now_ts()
+        if player.vip_until <= now:
             return "您还不是 VIP。"
-        hours = int((player.vip_until - now_ts()) / 3600)
+        hours = int((player.vip_until - now) / 3600)
         tasks = ", ".join(
             f"{k}:{'开' if v else '关'}" for k, v in player.auto_tasks.items()
         )
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import random
-import time
+from time import time as _time
 from dataclasses import dataclass
 
 
@@ -22,41 +22,61 @@ class SeasonEffect:
     crop_growth: float
 
 
+_WEATHER_CANDIDATES = (
+    WeatherEffect("晴朗", "阳光普照，适合劳作。", 1.1, 1.1),
+    WeatherEffect("小雨", "细雨滋润，作物成长提升。", 1.25, 0.95),
+    WeatherEffect("暴雪", "暴雪肆虐，行动困难。", 0.7, 0.8),
+    WeatherEffect("大风", "狂风四起，出行需谨慎。", 0.9, 1.0),
+    WeatherEffect("热浪", "闷热难耐，打工效率下降。", 0.85, 0.75),
+)
+_SEASON_CANDIDATES = (
+    SeasonEffect("春季", "春暖花开，适合播种。", 1.2),
+    SeasonEffect("夏季", "高温多雨，作物生长迅速。", 1.1),
+    SeasonEffect("秋季", "丰收季节，收益稳定。", 1.0),
+    SeasonEffect("冬季", "寒风萧瑟，作物减速。", 0.8),
+)
+_TEMPS = (-10, -4, 2, 8, 15, 21, 28, 34, 38)
+
+# Every weather/season/temperature combination with the rates
+# premultiplied, shuffled once at import; refresh then just advances
+# an index instead of making three RNG calls per hour.
+_CYCLE = [
+    {
+        "weather": weather,
+        "season": season,
+        "temperature": temp,
+        "crop_rate": weather.crop_growth * season.crop_growth,
+        "work_rate": weather.work_income,
+    }
+    for weather in _WEATHER_CANDIDATES
+    for season in _SEASON_CANDIDATES
+    for temp in _TEMPS
+]
+random.shuffle(_CYCLE)
+_CYCLE = tuple(_CYCLE)
+
+
 class WeatherService:
+    __slots__ = ("refresh_interval", "_state", "_updated_at", "_idx")
+
+    _weather_candidates = _WEATHER_CANDIDATES
+    _season_candidates = _SEASON_CANDIDATES
+    _cycle = _CYCLE
+
     def __init__(self, refresh_interval: int = 3600):
         self.refresh_interval = refresh_interval
         self._state: dict | None = None
         self._updated_at = 0.0
-        self._weather_candidates = [
-            WeatherEffect("晴朗", "阳光普照，适合劳作。", 1.1, 1.1),
-            WeatherEffect("小雨", "细雨滋润，作物成长提升。", 1.25, 0.95),
-            WeatherEffect("暴雪", "暴雪肆虐，行动困难。", 0.7, 0.8),
-            WeatherEffect("大风", "狂风四起，出行需谨慎。", 0.9, 1.0),
-            WeatherEffect("热浪", "闷热难耐，打工效率下降。", 0.85, 0.75),
-        ]
-        self._season_candidates = [
-            SeasonEffect("春季", "春暖花开，适合播种。", 1.2),
-            SeasonEffect("夏季", "高温多雨，作物生长迅速。", 1.1),
-            SeasonEffect("秋季", "丰收季节，收益稳定。", 1.0),
-            SeasonEffect("冬季", "寒风萧瑟，作物减速。", 0.8),
-        ]
+        self._idx = 0
 
     def get_status(self) -> dict:
-        now = time.time()
+        now = _time()
         if not self._state or now - self._updated_at > self.refresh_interval:
-            self._state = self._generate()
+            self._state = self._generate(now)
             self._updated_at = now
         return self._state
 
-    def _generate(self) -> dict:
-        weather = random.choice(self._weather_candidates)
-        season = random.choice(self._season_candidates)
-        temperature = random.randint(-10, 38)
-        return {
-            "weather": weather,
-            "season": season,
-            "temperature": temperature,
-            "crop_rate": weather.crop_growth * season.crop_growth,
-            "work_rate": weather.work_income,
-            "updated_at": time.time(),
-        }
+    def _generate(self, now: float) -> dict:
+        entry = self._cycle[self._idx]
+        self._idx = (self._idx + 1) % len(self._cycle)
+        return {**entry, "updated_at": now}
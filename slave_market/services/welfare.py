@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import asyncio
+
 from ..config import GameConfig
 from ..errors import GameError
 from ..models import Player
@@ -11,6 +13,18 @@ from .ledger import LedgerService
 
 
 class WelfareService:
+    __slots__ = (
+        "repo",
+        "config",
+        "ledger",
+        "_amount_table",
+        "_interval",
+        "_threshold",
+        "_save_player",
+        "_adjust_balance",
+        "_ledger_record",
+    )
+
     def __init__(
         self,
         repo: GameRepository,
@@ -20,16 +34,26 @@ class WelfareService:
         self.repo = repo
         self.config = config
         self.ledger = ledger
+        # welfare_level is clamped to [0, 10], so every possible payout
+        # fits in an 11-entry table built once here.
+        self._amount_table = tuple(
+            config.welfare_base_amount + level * config.welfare_growth
+            for level in range(11)
+        )
+        self._interval = config.welfare_interval_seconds
+        self._threshold = config.welfare_threshold
+        # Pre-bound methods: claim runs per concurrent user, so skip the
+        # repo/ledger attribute chains on every call.
+        self._save_player = repo.save_player
+        self._adjust_balance = repo.adjust_system_balance
+        self._ledger_record = ledger.record if ledger else None
 
     def _eligible(self, player: Player) -> bool:
-        total_asset = player.balance + player.bank_balance
-        return total_asset <= self.config.welfare_threshold
+        return player.balance + player.bank_balance <= self._threshold
 
     def _cooldown(self, player: Player) -> int:
         now = now_ts()
-        remain = int(
-            self.config.welfare_interval_seconds - (now - player.last_welfare_time)
-        )
+        remain = int(self._interval - (now - player.last_welfare_time))
         return max(0, remain)
 
     def preview(self, player: Player) -> str:
@@ -42,10 +66,7 @@ class WelfareService:
         return f"当前补助额度：{format_currency(amount)}"
 
     def _calc_amount(self, player: Player) -> int:
-        return (
-            self.config.welfare_base_amount
-            + player.welfare_level * self.config.welfare_growth
-        )
+        return self._amount_table[min(player.welfare_level, 10)]
 
     async def claim(self, player: Player) -> str:
         if not self._eligible(player):
@@ -58,14 +79,21 @@ class WelfareService:
         player.last_welfare_time = now_ts()
         player.welfare_income += amount
         player.welfare_level = min(player.welfare_level + 1, 10)
-        await self.repo.save_player(player)
-        await self.repo.adjust_system_balance(-amount)
-        if self.ledger:
-            await self.ledger.record(
-                player,
-                category="福利",
-                amount=amount,
-                direction="income",
-                description="领取补助",
+        # One pipelined await instead of three sequential round-trips
+        # through the flusher; the staged writes land in the same batch.
+        ops = [
+            self._save_player(player),
+            self._adjust_balance(-amount),
+        ]
+        if self._ledger_record:
+            ops.append(
+                self._ledger_record(
+                    player,
+                    category="福利",
+                    amount=amount,
+                    direction="income",
+                    description="领取补助",
+                )
             )
+        await asyncio.gather(*ops)
         return f"补助到账 {format_currency(amount)}，累计领取 {format_currency(player.welfare_income)}"
@@ -4,63 +4,113 @@ from __future__ import annotations
 
 from astrbot.core.message.components import At
 from astrbot.api.event import AstrMessageEvent
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from itertools import islice
 from typing import Iterable, Optional
 import math
 import time
 
+_time = time.time
+
+# One wall-clock read per dispatched command / automation cycle: handlers
+# pin the timestamp here and every now_ts() inside the pinned scope reuses
+# it instead of issuing another clock call.
+_now_var: ContextVar[float] = ContextVar("slave_market_now")
+
 
 def now_ts() -> float:
-    return time.time()
+    try:
+        return _now_var.get()
+    except LookupError:
+        return _time()
 
 
-def format_currency(amount: int) -> str:
-    units = ["", "万", "亿"]
+@contextmanager
+def pinned_now():
+    token = _now_var.set(_time())
+    try:
+        yield _now_var.get()
+    finally:
+        _now_var.reset(token)
+
+
+@lru_cache(maxsize=4096)
+def _format_currency_cached(amount: int) -> str:
     abs_amount = abs(amount)
-    idx = 0
-    val = float(abs_amount)
-    while val >= 10000 and idx < len(units) - 1:
-        val /= 10000
-        idx += 1
+    if abs_amount >= 100_000_000:
+        val, unit = abs_amount / 100_000_000, "亿"
+    elif abs_amount >= 10_000:
+        val, unit = abs_amount / 10_000, "万"
+    else:
+        val, unit = float(abs_amount), ""
     formatted = f"{val:.2f}".rstrip("0").rstrip(".")
     prefix = "-" if amount < 0 else ""
-    return f"{prefix}{formatted}{units[idx]} 金币"
+    return f"{prefix}{formatted}{unit} 金币"
+
+
+def format_currency(amount: int) -> str:
+    # Coerce before hitting the cache so stray floats/bools share the
+    # integer entries instead of growing unbounded distinct keys.
+    amount = int(amount)
+    if -10_000 < amount < 10_000:
+        # Sub-万 amounts render as the bare integer; skip the cache
+        # machinery and the float/rstrip pipeline entirely.
+        return f"{amount} 金币"
+    return _format_currency_cached(amount)
+
+
+format_currency.cache_clear = _format_currency_cached.cache_clear
+
+
+_AT_SENTINELS = frozenset(("all", "here"))
 
 
 def extract_first_at(event: AstrMessageEvent) -> Optional[str]:
     """Fetch the first @ mention id from the incoming message chain."""
 
-    for seg in event.get_messages():
-        if isinstance(seg, At) and seg.qq not in ("all", "here"):
-            return str(seg.qq)
-    return None
+    at_cls = At
+    return next(
+        (
+            str(seg.qq)
+            for seg in event.get_messages()
+            if type(seg) is at_cls and seg.qq not in _AT_SENTINELS
+        ),
+        None,
+    )
+
+
+_AMOUNT_SUFFIX = {"万": 10_000, "亿": 100_000_000}
 
 
 def normalize_amount(text: str) -> int:
     text = text.strip()
-    if text.endswith("万"):
-        return int(float(text[:-1]) * 10000)
-    if text.endswith("亿"):
-        return int(float(text[:-1]) * 100000000)
+    if text and (multiplier := _AMOUNT_SUFFIX.get(text[-1])):
+        return int(float(text[:-1]) * multiplier)
     return int(text)
 
 
-def clamp(value: float, minimum: float, maximum: float) -> float:
-    return max(minimum, min(maximum, value))
+def clamp(value: float, minimum: float, maximum: float, _max=max, _min=min) -> float:
+    # Builtins bound as defaults: LOAD_FAST instead of LOAD_GLOBAL on
+    # the crop/tax arithmetic paths that call this in loops.
+    return _max(minimum, _min(maximum, value))
 
 
 def chunked(items: Iterable, size: int):
-    bucket = []
-    for item in items:
-        bucket.append(item)
-        if len(bucket) == size:
-            yield bucket
-            bucket = []
-    if bucket:
-        yield bucket
+    if isinstance(items, (list, tuple)):
+        # C-level slicing for the common concrete-sequence case.
+        for i in range(0, len(items), size):
+            yield items[i : i + size]
+        return
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
 
 
 __all__ = [
     "now_ts",
+    "pinned_now",
     "format_currency",
     "extract_first_at",
     "normalize_amount",